@@ -0,0 +1,221 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from utils import calculate_speed_multiplier
+
+# Status hasil permainan dalam simulasi
+RUNNING, WIN, LOSE_RED, TIMEOUT = 0, 1, 2, 3
+
+# Fase lampu dalam simulasi (sama urutannya dengan Game: hijau -> transisi 0.5 detik -> merah)
+GREEN, TRANSITION, RED = 0, 1, 2
+TRANSITION_DURATION = 0.5
+
+# Durasi cue suara (detik) yang memblokir game loop: greenLight.mp3 diputar setelah timer
+# hijau dimulai, redLight.mp3 diputar di awal transisi. Dipakai jika file aset tidak bisa diukur.
+DEFAULT_GREEN_CUE_DURATION = 0.94
+DEFAULT_RED_CUE_DURATION = 0.65
+ASSETS_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "assets")
+
+
+def measure_cue_durations(assets_dir=ASSETS_DIR):
+    """
+    Mengukur durasi cue lampu hijau dan merah dari file aset dengan pygame.mixer.
+
+    Returns:
+        tuple: (durasi cue hijau, durasi cue merah) dalam detik; nilai default jika gagal diukur.
+    """
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        import pygame
+        pygame.mixer.init()
+        green = pygame.mixer.Sound(os.path.join(assets_dir, "greenLight.mp3")).get_length()
+        red = pygame.mixer.Sound(os.path.join(assets_dir, "redLight.mp3")).get_length()
+        pygame.mixer.quit()
+        return green, red
+    except Exception as e:
+        print(f"Peringatan: durasi cue tidak dapat diukur ({e}), memakai nilai default.")
+        return DEFAULT_GREEN_CUE_DURATION, DEFAULT_RED_CUE_DURATION
+
+
+def simulate_games(n_games, movement_speed=15, min_sound_threshold_to_move=0.01, max_sound_volume=0.2,
+                   green_duration_range=(2, 5), red_duration_range=(1, 3), game_duration_range=(50, 61),
+                   window_width=1280, start_x=55, tick_seconds=0.15, green_cue_duration=DEFAULT_GREEN_CUE_DURATION,
+                   red_cue_duration=DEFAULT_RED_CUE_DURATION, seed=0):
+    """
+    Mensimulasikan banyak permainan sekaligus sebagai array NumPy (satu elemen per permainan).
+    Aturan mengikuti Game.tick dan Environment: pemain bergerak saat lampu hijau jika volume
+    melewati ambang batas, kalah jika bersuara saat lampu merah, dan kalah jika waktu habis.
+
+    Setiap permainan memiliki profil suara sintetis acak: kenyaringan, pitch, peluang bersuara
+    per tick saat hijau, peluang keceplosan per tick saat merah, dan peluang masih bersuara
+    pada tick pertama lampu merah (reaksi lambat).
+
+    Cue suara yang memblokir game loop dimodelkan sebagai waktu mati: selama cue hijau diputar
+    (di awal setiap fase hijau, timer hijau dan timer permainan sudah berjalan) pemain tidak
+    bisa bergerak, dan transisi ke merah berlangsung selama cue merah jika lebih lama dari 0.5 detik.
+
+    Returns:
+        tuple: (outcome, finish_time) berupa array berukuran n_games.
+    """
+    rng = np.random.default_rng(seed)
+    finish_x = window_width - 160 + 20  # Environment.reached_finish_line
+
+    # Profil suara per permainan
+    loudness = rng.lognormal(np.log(0.06), 0.6, n_games)
+    pitch_mean = rng.uniform(110, 450, n_games)
+    talk_probability = rng.beta(6, 2, n_games)
+    slip_probability = rng.beta(1, 60, n_games)
+    reaction_probability = rng.beta(2, 8, n_games)
+
+    # Status awal setiap permainan
+    x = np.full(n_games, float(start_x))
+    elapsed = 0.0
+    game_duration = rng.integers(*game_duration_range, size=n_games).astype(np.float64)
+    phase = np.full(n_games, GREEN, dtype=np.int8)
+    phase_end = rng.integers(*green_duration_range, size=n_games).astype(np.float64)
+    cue_end = np.full(n_games, green_cue_duration)  # Game.start_game memutar cue hijau setelah timer dimulai
+    transition_duration = max(TRANSITION_DURATION, red_cue_duration)
+    was_talking = np.zeros(n_games, dtype=bool)
+    first_red_tick = np.zeros(n_games, dtype=bool)
+    outcome = np.full(n_games, RUNNING, dtype=np.int8)
+    finish_time = np.full(n_games, np.nan)
+
+    max_ticks = int(np.ceil(game_duration_range[1] / tick_seconds)) + 1
+    for _ in range(max_ticks):
+        running = outcome == RUNNING
+        if not running.any():
+            break
+        elapsed += tick_seconds
+
+        # Sampel suara untuk tick ini
+        noise = rng.uniform(0.0, 0.004, n_games)
+        voice_volume = loudness * rng.lognormal(0.0, 0.3, n_games)
+        pitch = pitch_mean * rng.lognormal(0.0, 0.08, n_games)
+
+        # Lampu hijau: bergerak jika suara melewati ambang batas (tidak selama cue hijau masih diputar)
+        green = running & (phase == GREEN) & (elapsed > cue_end)
+        talking = green & (rng.random(n_games) < talk_probability)
+        volume = np.where(talking, voice_volume, noise)
+        detected = green & (volume > min_sound_threshold_to_move)
+        speed = movement_speed + calculate_speed_multiplier(volume, pitch, min_sound_threshold_to_move, max_sound_volume)
+        x = np.where(detected, x + speed, x)
+        was_talking = np.where(green, talking, was_talking)
+
+        # Lampu merah: kalah jika bersuara (keceplosan atau reaksi lambat di tick pertama)
+        red = running & (phase == RED)
+        slip = rng.random(n_games) < slip_probability
+        late = first_red_tick & was_talking & (rng.random(n_games) < reaction_probability)
+        red_volume = np.where(slip | late, voice_volume, noise)
+        lost = red & (red_volume > min_sound_threshold_to_move)
+        first_red_tick &= ~red
+        outcome[lost] = LOSE_RED
+
+        # Pergantian fase lampu
+        phase_over = running & (elapsed >= phase_end)
+        to_transition = phase_over & (phase == GREEN)
+        to_red = phase_over & (phase == TRANSITION)
+        to_green = phase_over & (phase == RED) & ~lost
+        phase_end = np.where(to_transition, elapsed + transition_duration, phase_end)
+        phase_end = np.where(to_red, elapsed + rng.integers(*red_duration_range, size=n_games), phase_end)
+        phase_end = np.where(to_green, elapsed + rng.integers(*green_duration_range, size=n_games), phase_end)
+        cue_end = np.where(to_green, elapsed + green_cue_duration, cue_end)
+        phase[to_transition] = TRANSITION
+        phase[to_red] = RED
+        phase[to_green] = GREEN
+        first_red_tick |= to_red
+
+        # Kondisi menang dan waktu habis (urutan sama dengan Game.check_win_lose_conditions)
+        still_running = outcome == RUNNING
+        won = still_running & (x > finish_x)
+        outcome[won] = WIN
+        finish_time[won] = elapsed
+        outcome[still_running & ~won & (elapsed >= game_duration)] = TIMEOUT
+
+    outcome[outcome == RUNNING] = TIMEOUT
+    return outcome, finish_time
+
+
+def evaluate_parameters(params):
+    # Tugas untuk satu kombinasi parameter di proses worker; mengembalikan ringkasan statistik
+    params = dict(params)
+    n_games = params.pop("n_games")
+    outcome, finish_time = simulate_games(n_games, **params)
+    wins = finish_time[outcome == WIN]
+    summary = {key: value for key, value in params.items() if key != "seed"}
+    summary.update({
+        "win_rate": float(np.mean(outcome == WIN)),
+        "lose_red_rate": float(np.mean(outcome == LOSE_RED)),
+        "timeout_rate": float(np.mean(outcome == TIMEOUT)),
+        "finish_p10": float(np.percentile(wins, 10)) if len(wins) else np.nan,
+        "finish_p50": float(np.percentile(wins, 50)) if len(wins) else np.nan,
+        "finish_p90": float(np.percentile(wins, 90)) if len(wins) else np.nan,
+    })
+    return summary
+
+
+def parse_range(text):
+    # Mengubah teks "min,max" menjadi tuple (min, max)
+    low, high = (int(v) for v in text.split(","))
+    return (low, high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulator Monte-Carlo untuk menyeimbangkan parameter permainan.")
+    parser.add_argument("--movement-speed", type=float, nargs="+", default=[15])
+    parser.add_argument("--min-threshold", type=float, nargs="+", default=[0.01])
+    parser.add_argument("--max-volume", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--green-range", type=parse_range, nargs="+", default=[(2, 5)], help="Contoh: 2,5")
+    parser.add_argument("--red-range", type=parse_range, nargs="+", default=[(1, 3)], help="Contoh: 1,3")
+    parser.add_argument("--game-duration", type=parse_range, nargs="+", default=[(50, 61)], help="Contoh: 50,61")
+    parser.add_argument("--window-width", type=int, default=1280, help="Lebar jendela permainan (menentukan garis finish)")
+    parser.add_argument("--tick", type=float, default=0.15, help="Durasi satu tick permainan dalam detik")
+    parser.add_argument("--green-cue", type=float, default=None, help="Durasi cue lampu hijau (default: diukur dari assets/)")
+    parser.add_argument("--red-cue", type=float, default=None, help="Durasi cue lampu merah (default: diukur dari assets/)")
+    parser.add_argument("--games", type=int, default=100000, help="Jumlah permainan per kombinasi parameter")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Simpan hasil ke file CSV")
+    args = parser.parse_args()
+
+    if args.green_cue is None or args.red_cue is None:
+        measured_green, measured_red = measure_cue_durations()
+        args.green_cue = measured_green if args.green_cue is None else args.green_cue
+        args.red_cue = measured_red if args.red_cue is None else args.red_cue
+    print(f"Cue hijau {args.green_cue:.2f} detik, cue merah {args.red_cue:.2f} detik (waktu mati).")
+
+    grid = itertools.product(args.movement_speed, args.min_threshold, args.max_volume,
+                             args.green_range, args.red_range, args.game_duration)
+    tasks = [{
+        "n_games": args.games,
+        "movement_speed": speed,
+        "min_sound_threshold_to_move": threshold,
+        "max_sound_volume": max_volume,
+        "green_duration_range": green,
+        "red_duration_range": red,
+        "game_duration_range": duration,
+        "window_width": args.window_width,
+        "tick_seconds": args.tick,
+        "green_cue_duration": args.green_cue,
+        "red_cue_duration": args.red_cue,
+        "seed": args.seed + i,
+    } for i, (speed, threshold, max_volume, green, red, duration) in enumerate(grid)]
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = pd.DataFrame(pool.map(evaluate_parameters, tasks))
+    duration = time.time() - start_time
+
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(results.sort_values("win_rate", ascending=False).to_string(index=False))
+    print(f"\n{len(tasks)} kombinasi x {args.games} permainan dalam {duration:.1f} detik.")
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
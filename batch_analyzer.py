@@ -0,0 +1,186 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+import numpy as np
+import pandas as pd
+from scipy.io import wavfile
+
+from input_handler import InputHandler
+from spectral_features import SpectralAnalyzer
+from utils import is_visible, calculate_sum
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+AUDIO_EXTENSIONS = (".wav",)
+
+# Jumlah blok audio per potongan STFT (membatasi memori spektrum untuk rekaman panjang)
+AUDIO_CHUNK_BLOCKS = 256
+
+
+def analyze_video(path, blur=True):
+    """
+    Memproses video rekaman frame demi frame dengan InputHandler.process_frame.
+
+    Returns:
+        pandas.DataFrame: Satu baris per frame berisi waktu, status deteksi, visibilitas,
+        calculate_sum, serta x, y, visibility dari setiap landmark.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Video tidak dapat dibuka: '{path}'")
+    # InputHandler baru per video: model pose melacak ROI antar frame, jadi tidak boleh
+    # membawa hasil pelacakan dari video sebelumnya
+    handler = InputHandler()
+
+    rows = []
+    frame_index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if blur:
+            frame = cv2.blur(frame, (5, 5))  # Sama seperti Game.handle_input
+        results = handler.process_frame(frame)
+
+        row = {"frame": frame_index, "time": cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0}
+        if results and results.pose_landmarks:
+            landmarks = results.pose_landmarks.landmark
+            row["detected"] = True
+            row["visible"] = is_visible(landmarks)
+            row["body_sum"] = calculate_sum(landmarks)
+            for i, lm in enumerate(landmarks):
+                row[f"lm{i}_x"] = lm.x
+                row[f"lm{i}_y"] = lm.y
+                row[f"lm{i}_visibility"] = lm.visibility
+        else:
+            row.update(detected=False, visible=False, body_sum=0.0)
+        rows.append(row)
+        frame_index += 1
+
+    cap.release()
+    handler.close()
+    return pd.DataFrame(rows)
+
+
+def _to_float_mono(data):
+    # Ubah potongan WAV ke float32 mono dalam rentang [-1, 1] seperti keluaran sounddevice
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.float32) / np.iinfo(data.dtype).max
+    else:
+        data = data.astype(np.float32)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return data
+
+
+def analyze_audio(path, block_duration=0.1, hop_duration=None, lowcut=128.0, highcut=1024.0, order=5,
+                  chunk_blocks=AUDIO_CHUNK_BLOCKS):
+    """
+    Menganalisis file WAV sebagai matriks blok (STFT tanpa overlap secara default).
+    File dibaca lewat mmap dan diproses per potongan berisi `chunk_blocks` blok, sehingga
+    memori tetap kecil untuk rekaman berjam-jam. RMS dan pitch dihitung dengan SpectralAnalyzer
+    yang sama seperti InputHandler.get_user_voice_volume_and_pitch (band-pass di domain
+    frekuensi per blok), sehingga ambang batas bisa disetel offline terhadap perhitungan live.
+
+    Returns:
+        pandas.DataFrame: Satu baris per blok berisi waktu mulai, RMS, dan pitch.
+    """
+    try:
+        fs, data = wavfile.read(path, mmap=True)
+    except ValueError:
+        fs, data = wavfile.read(path)  # Format tanpa dukungan mmap (mis. PCM 24-bit)
+
+    block_size = int(block_duration * fs)
+    hop_size = int(hop_duration * fs) if hop_duration else block_size
+    if len(data) < block_size:
+        return pd.DataFrame(columns=["block", "time", "rms", "pitch"])
+
+    num_blocks = 1 + (len(data) - block_size) // hop_size
+    rms = np.empty(num_blocks, dtype=np.float32)
+    pitch = np.empty(num_blocks, dtype=np.float32)
+
+    analyzer = SpectralAnalyzer(block_size, fs=fs, lowcut=lowcut, highcut=highcut, order=order)
+    pending = np.empty(0, dtype=np.float32)  # Sampel yang masih dibutuhkan blok berikutnya
+    pending_start = 0                        # Indeks sampel pertama di `pending`
+    position = 0                             # Jumlah sampel yang sudah dibaca
+
+    for first in range(0, num_blocks, chunk_blocks):
+        last = min(num_blocks, first + chunk_blocks)
+        needed_end = (last - 1) * hop_size + block_size
+        buffer = np.concatenate([pending, _to_float_mono(data[position:needed_end])])
+        position = needed_end
+
+        offset = first * hop_size - pending_start
+        blocks = np.lib.stride_tricks.sliding_window_view(buffer, block_size)[offset::hop_size][:last - first]
+        features = analyzer.analyze(blocks)
+        rms[first:last] = features["rms"]
+        pitch[first:last] = features["pitch"]
+
+        # Simpan hanya ekor yang tumpang tindih dengan blok pada potongan berikutnya
+        keep_from = min(last * hop_size, position)
+        pending = buffer[keep_from - pending_start:]
+        pending_start = keep_from
+
+    return pd.DataFrame({
+        "block": np.arange(num_blocks),
+        "time": np.arange(num_blocks) * hop_size / fs,
+        "rms": rms,
+        "pitch": pitch,
+    })
+
+
+def analyze_file(path, output_dir, input_dir, hop_duration=None):
+    # Tugas untuk satu file di dalam proses worker; menulis tabel CSV dan mengembalikan ringkasan
+    start_time = time.time()
+    relative = os.path.splitext(os.path.relpath(path, input_dir))[0]
+    output_base = os.path.join(output_dir, relative)
+    os.makedirs(os.path.dirname(output_base), exist_ok=True)
+
+    if path.lower().endswith(VIDEO_EXTENSIONS):
+        table = analyze_video(path)
+        output_path = output_base + "_pose.csv"
+    else:
+        table = analyze_audio(path, hop_duration=hop_duration)
+        output_path = output_base + "_audio.csv"
+    table.to_csv(output_path, index=False)
+    return path, output_path, len(table), time.time() - start_time
+
+
+def find_session_files(input_dir):
+    # Mencari semua file video dan audio di dalam direktori (rekursif)
+    paths = []
+    for root, _, files in os.walk(input_dir):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS + AUDIO_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisis offline rekaman sesi (MP4 dan WAV) secara paralel.")
+    parser.add_argument("input_dir", help="Direktori berisi rekaman sesi")
+    parser.add_argument("--output-dir", default="analysis", help="Direktori tujuan tabel CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses worker")
+    parser.add_argument("--hop", type=float, default=None, help="Jarak antar blok audio dalam detik (default: 0.1, tanpa overlap)")
+    args = parser.parse_args()
+
+    paths = find_session_files(args.input_dir)
+    if not paths:
+        print(f"Tidak ada file MP4/WAV di '{args.input_dir}'.")
+        return
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(analyze_file, path, args.output_dir, args.input_dir, args.hop) for path in paths]
+        for future in as_completed(futures):
+            try:
+                path, output_path, rows, duration = future.result()
+                print(f"{path}: {rows} baris -> {output_path} ({duration:.1f} detik)")
+            except Exception as e:
+                print(f"Error saat menganalisis file: {e}")
+    print(f"Selesai: {len(paths)} file dalam {time.time() - start_time:.1f} detik.")
+
+
+if __name__ == '__main__':
+    main()
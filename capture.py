@@ -0,0 +1,205 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+
+class SyntheticFrameSource:
+    """
+    Sumber frame sintetis (kotak bergerak di atas gradien) untuk pengujian tanpa kamera.
+    """
+    def __init__(self, width=640, height=480):
+        self.width = width
+        self.height = height
+        self.frame_index = 0
+        gradient = np.linspace(0, 255, width, dtype=np.uint8)
+        self.background = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+
+    def __call__(self):
+        # Menghasilkan satu frame BGR baru
+        frame = self.background.copy()
+        x = (self.frame_index * 7) % (self.width - 80)
+        frame[self.height // 3:self.height // 3 + 120, x:x + 80] = (40, 180, 220)
+        self.frame_index += 1
+        return frame
+
+
+class CameraCapture:
+    """
+    Abstraksi pengambilan frame berlatensi rendah. Thread latar belakang terus mengambil
+    frame (grab/retrieve) dan hanya menyimpan frame terbaru, sehingga read() tidak pernah
+    mengembalikan frame lama dari buffer driver. Antarmukanya mengikuti cv2.VideoCapture
+    (isOpened, read, release) agar bisa langsung dipakai oleh Game.
+
+    Sumber yang didukung:
+        - int: indeks perangkat kamera
+        - str: path file video (diputar sesuai FPS file)
+        - callable: generator frame sintetis (mis. SyntheticFrameSource)
+    """
+    def __init__(self, source=0, width=640, height=480, fps=30, fourcc="MJPG", buffer_size=1,
+                 loop=False, read_timeout=1.0, startup_timeout=10.0):
+        """
+        Parameters:
+            source (int | str | callable): Sumber frame.
+            width (int): Lebar frame yang diminta dari kamera.
+            height (int): Tinggi frame yang diminta dari kamera.
+            fps (float): FPS yang diminta dari kamera (dan kecepatan sumber sintetis).
+            fourcc (str | None): Kode codec kamera, mis. "MJPG" (None = bawaan driver).
+            buffer_size (int): Ukuran buffer internal driver (CAP_PROP_BUFFERSIZE).
+            loop (bool): Ulangi file video dari awal ketika habis.
+            read_timeout (float): Waktu tunggu maksimum read() untuk frame baru setelah frame mengalir (detik).
+            startup_timeout (float | None): Waktu tunggu maksimum untuk frame pertama (detik); webcam
+                bisa butuh beberapa detik sebelum frame pertama keluar. None = tunggu tanpa batas.
+        """
+        self.source = source
+        self.loop = loop
+        self.read_timeout = read_timeout
+        self.startup_timeout = startup_timeout
+        self.cap = None
+        self.generator = None
+
+        if callable(source):
+            self.generator = source
+            self.frame_interval = 1.0 / fps if fps else 0.0
+        else:
+            self.cap = cv2.VideoCapture(source)
+            if isinstance(source, int) and self.cap.isOpened():
+                # Minta format dan ukuran eksplisit, serta buffer driver sekecil mungkin
+                if fourcc:
+                    self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+                self.frame_interval = 0.0  # Kamera sudah memberi ritme sendiri
+            else:
+                # File video diputar sesuai FPS aslinya
+                file_fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+                self.frame_interval = 1.0 / file_fps if file_fps > 0 else 1.0 / fps
+
+        # Frame terbaru beserta penanda dan waktu pengambilannya
+        self._condition = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._frame_time = 0.0
+        self._last_read_id = 0
+        self._running = self.isOpened()
+
+        # Statistik pengambilan
+        self.captured_frames = 0
+        self.read_frames = 0
+        self.capture_fps = 0.0
+        self._frame_age_total = 0.0
+        self.last_wait_time = 0.0  # Lama read() terakhir menunggu frame baru (detik)
+
+        self._thread = None
+        if self._running:
+            self._thread = threading.Thread(target=self._capture_loop, name="CameraCapture", daemon=True)
+            self._thread.start()
+
+    def isOpened(self):
+        # True jika sumber frame siap dipakai
+        return self.generator is not None or (self.cap is not None and self.cap.isOpened())
+
+    def _next_frame(self):
+        # Mengambil satu frame dari sumber; mengembalikan None jika sumber habis atau gagal
+        if self.generator is not None:
+            return self.generator()
+        if not self.cap.grab():
+            if self.loop and not isinstance(self.source, int):
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                if not self.cap.grab():
+                    return None
+            else:
+                return None
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+
+    def _capture_loop(self):
+        # Thread latar belakang: ambil frame terus-menerus dan simpan hanya yang terbaru
+        last_time = None
+        while self._running:
+            frame_start = time.time()
+            frame = self._next_frame()
+            now = time.time()
+            with self._condition:
+                if frame is None:
+                    self._running = False
+                    self._condition.notify_all()
+                    break
+                self._frame = frame
+                self._frame_id += 1
+                self._frame_time = now
+                self._condition.notify_all()
+
+            self.captured_frames += 1
+            if last_time is not None and now > last_time:
+                instant_fps = 1.0 / (now - last_time)
+                self.capture_fps = instant_fps if self.capture_fps == 0 else 0.9 * self.capture_fps + 0.1 * instant_fps
+            last_time = now
+
+            # Sumber non-kamera diberi ritme sesuai FPS-nya
+            if self.frame_interval > 0:
+                remaining = self.frame_interval - (time.time() - frame_start)
+                if remaining > 0:
+                    time.sleep(remaining)
+
+    def read(self):
+        """
+        Mengembalikan frame terbaru yang belum pernah dibaca, menunggu hingga read_timeout jika perlu
+        (startup_timeout selama frame pertama belum ada).
+
+        Lama waktu menunggu disimpan di last_wait_time agar pemanggil bisa memisahkannya
+        dari waktu kerja sendiri.
+
+        Returns:
+            tuple: (ret, frame) seperti cv2.VideoCapture.read().
+        """
+        wait_start = time.time()
+        with self._condition:
+            timeout = self.read_timeout if self._frame is not None else self.startup_timeout
+            deadline = wait_start + timeout if timeout is not None else None
+            while self._frame_id == self._last_read_id and self._running:
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            self.last_wait_time = time.time() - wait_start
+
+            if self._frame is None or (self._frame_id == self._last_read_id and not self._running):
+                return False, None
+
+            self._last_read_id = self._frame_id
+            self.read_frames += 1
+            self._frame_age_total += time.time() - self._frame_time
+            return True, self._frame
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: FPS pengambilan terukur, rata-rata usia frame saat dibaca (detik),
+            dan jumlah frame yang dilewati karena ada frame yang lebih baru.
+        """
+        return {
+            "capture_fps": self.capture_fps,
+            "average_frame_age": self._frame_age_total / self.read_frames if self.read_frames else 0.0,
+            "skipped_frames": self.captured_frames - self.read_frames,
+        }
+
+    def release(self):
+        # Menghentikan thread pengambilan dan melepaskan kamera
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self.cap is not None:
+            self.cap.release()
+
+        stats = self.get_stats()
+        if self.read_frames:
+            print(f"Kamera: {stats['capture_fps']:.1f} FPS, usia frame rata-rata "
+                  f"{stats['average_frame_age'] * 1000:.1f} ms, {stats['skipped_frames']} frame dilewati")
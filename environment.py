@@ -8,7 +8,8 @@ class Environment:
     yang berubah-ubah secara acak sesuai parameter yang diberikan.
     """
 
-    def __init__(self, window_width=800, green_duration_range=(2, 5), red_duration_range=(1, 3), game_duration_range=(50, 61)):
+    def __init__(self, window_width=800, green_duration_range=(2, 5), red_duration_range=(1, 3), game_duration_range=(50, 61),
+                 render_scale=1.0):
         """
         Inisialisasi environment dengan pengaturan awal.
 
@@ -17,10 +18,12 @@ class Environment:
             green_duration_range (tuple): Rentang durasi lampu hijau (min, max) dalam detik.
             red_duration_range (tuple): Rentang durasi lampu merah (min, max) dalam detik.
             game_duration_range (tuple): Rentang durasi total permainan (min, max) dalam detik.
+            render_scale (float): Skala resolusi render; jarak garis finish dalam piksel ikut diskalakan.
         """
 
         # Garis finish horizontal sebagai target pemain
-        self.finish_line_x = window_width - 160  # Sesuaikan dengan ukuran karakter/player
+        self.finish_line_x = window_width - 160 * render_scale  # Sesuaikan dengan ukuran karakter/player
+        self.finish_tolerance = 20 * render_scale
 
         # Status lampu lalu lintas: "initial", "green", atau "red"
         self.light_status = "initial"
@@ -236,7 +239,7 @@ class Environment:
         Returns:
             bool: True jika pemain melewati garis finish, False selainnya.
         """
-        return player_x > self.finish_line_x + 20
+        return player_x > self.finish_line_x + self.finish_tolerance
 
 
     def pause(self):
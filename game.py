@@ -7,11 +7,15 @@ import os
 
 # Import semua komponen game yang diperlukan
 from player import Player
+from sprites import SkinLibrary, FRAME_SIZE
 from environment import Environment
 from input_handler import InputHandler
 from visualizer import Visualizer, Button
 from sound_manager import SoundManager
-from utils import is_visible
+from capture import CameraCapture
+from tracing import tracer, traced
+from replay import ReplayBuffer
+from utils import is_visible, calculate_speed_multiplier
 
 #ambil path direktori utama tempat script dijalankan (main.py)
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -23,28 +27,36 @@ class Game:
     """
     Kelas utama yang mengatur seluruh alur permainan, termasuk logika game loop, input pengguna, deteksi webcam, suara, dan visualisasi.
     """
-    def __init__(self):
+    def __init__(self, telemetry=None, quality=None, pose_backend="legacy", capture=None, audio_source=None,
+                 replay_seconds=5.0, replay_export_dir=None, skin="mario"):
         # insialisasi Pygame dan font
         pygame.init()
         pygame.font.init()
         # inisialisasi semua komponen game
 
         self.sound_manager = SoundManager(assets_dir=ASSETS_DIR)
-        self.input_handler = InputHandler()
-        self.player = Player(gif_path=os.path.join(ASSETS_DIR, 'mario.gif'))
-        self.environment = Environment()
+        self.input_handler = self._create_input_handler(pose_backend, audio_source)
+        # Pengatur kualitas adaptif (opsional, dibagikan antar ronde oleh main.py)
+        self.quality = quality
+        render_scale = quality.tier.render_scale if quality else 1.0
         self.visualizer = Visualizer(im1_path=os.path.join(ASSETS_DIR, 'im1.png'),
-                                     im2_path=os.path.join(ASSETS_DIR, 'im2.png'))
-        
-        self.environment = Environment(window_width=self.visualizer.window_width)
+                                     im2_path=os.path.join(ASSETS_DIR, 'im2.png'),
+                                     render_scale=render_scale)
+        px = self.visualizer.scaled  # Ukuran piksel resolusi penuh -> resolusi render
+
+        # Skin karakter dimuat lazy ke texture atlas; library dibuat ulang per Game karena pygame.quit membuang surface
+        self.skins = SkinLibrary(ASSETS_DIR, frame_size=(px(FRAME_SIZE[0]), px(FRAME_SIZE[1])))
+        self.player = Player(start_x=px(55), skin_library=self.skins, skin_name=skin)
+        self.environment = Environment(window_width=self.visualizer.window_width, render_scale=render_scale)
+        self.visualizer.pose_connections = self.input_handler.pose_connections
 
         # tentukan posisi awal karakter pemain
         player_game_area_y = self.visualizer.game_area_height - self.player.character_height
         self.player.y = player_game_area_y
         self.player.initial_y = player_game_area_y # digunakan untuk reset posisi
 
-        # inisialisasi webcam untuk menangkap input pengguna
-        self.cap = cv2.VideoCapture(0)
+        # inisialisasi webcam untuk menangkap input pengguna (atau sumber frame pengganti, mis. saat pengujian)
+        self.cap = capture if capture is not None else CameraCapture(0, width=640, height=480, fps=30, fourcc="MJPG")
         if not self.cap.isOpened():
             print("ERROR: Tidak dapat mengakses webcam. Pastikan webcam terhubung dan tidak digunakan oleh aplikasi lain.")
             self.is_running = False
@@ -58,70 +70,134 @@ class Game:
         self.paused = False
         self.user_body_sum_red_light = 0
 
-        self.movement_speed = 15
+        self.movement_speed = 15 * self.visualizer.render_scale  # kecepatan dalam piksel resolusi render
         self.threshold_dist_body = 180
         self.min_sound_threshold_to_move = 0.01
         self.max_sound_volume = 0.2
 
+        # Perekam telemetri sesi (opsional, dibagikan antar ronde oleh main.py)
+        self.telemetry = telemetry
+        self._tick_start_time = None
+        self._tick_volume = float("nan")
+        self._tick_pitch = float("nan")
+        self._tick_visibility = float("nan")
+        self._tick_audio_time = 0.0
+        self._tick_sound_time = 0.0
+        self._tick_capture_time = 0.0
+
+        # Pengaturan kualitas yang bisa diubah saat permainan berjalan
+        self.blur_enabled = True
+        self.draw_landmarks_enabled = True
+        if self.quality:
+            self.apply_quality_tier(self.quality.tier)
+
+        # Instant replay: rekam beberapa detik terakhir untuk diputar saat pemain tereliminasi di lampu merah
+        self.replay = ReplayBuffer((self.visualizer.window_width, self.visualizer.window_height),
+                                   seconds=replay_seconds) if replay_seconds else None
+        self.visualizer.replay = self.replay
+        self.replay_export_dir = replay_export_dir
+        self.eliminated_in_red = False
+
         # Inisialisasi notifikasi awal dan tombol
         self.notification = "Tekan 'S' untuk memulai\nTekan Spasi untuk Pause"
+        if len(self.skins.names) > 1:
+            self.notification += "\nTekan 'C' untuk ganti karakter"
         self.buttons = [
-            Button("Start (S)", self.visualizer.window_width // 2 - 150, self.visualizer.window_height - 100, 150, 50),
-            Button("Quit (Q)", self.visualizer.window_width // 2 + 50, self.visualizer.window_height - 100, 150, 50)
+            Button("Start (S)", self.visualizer.window_width // 2 - px(150), self.visualizer.window_height - px(100),
+                   px(150), px(50), font_size=px(36)),
+            Button("Quit (Q)", self.visualizer.window_width // 2 + px(50), self.visualizer.window_height - px(100),
+                   px(150), px(50), font_size=px(36))
         ]
         self.red_light_delay_start_time = 0
-        self.play_again_button = Button("Play Again", self.visualizer.window_width // 2 - 100, self.visualizer.window_height // 2 + 100, 150, 50)
-        self.exit_button = Button("Exit", self.visualizer.window_width // 2 + 100, self.visualizer.window_height // 2 + 100, 150, 50)
+        self.play_again_button = Button("Play Again", self.visualizer.window_width // 2 - px(100), self.visualizer.window_height // 2 + px(100),
+                                        px(150), px(50), font_size=px(36))
+        self.exit_button = Button("Exit", self.visualizer.window_width // 2 + px(100), self.visualizer.window_height // 2 + px(100),
+                                  px(150), px(50), font_size=px(36))
 
 
+    def _create_input_handler(self, pose_backend, audio_source=None):
+        """
+        Membuat InputHandler sesuai backend pose: "legacy" (mp.solutions.pose, sinkron)
+        atau "live_stream" (MediaPipe Tasks PoseLandmarker, asinkron).
+        """
+        if pose_backend == "live_stream":
+            try:
+                from pose_landmarker_handler import PoseLandmarkerInputHandler
+                # Tanpa PoseTracker: hasil asinkron berasal dari frame yang lebih lama daripada frame
+                # saat ini, sehingga optical flow akan dimulai dari posisi yang tidak sesuai gambarnya
+                return PoseLandmarkerInputHandler(keyframe_mode=False, audio_source=audio_source)
+            except (ImportError, FileNotFoundError) as e:
+                print(f"Backend pose 'live_stream' tidak tersedia ({e}). Menggunakan backend 'legacy'.")
+        elif pose_backend != "legacy":
+            print(f"Backend pose '{pose_backend}' tidak dikenal. Menggunakan backend 'legacy'.")
+        return InputHandler(keyframe_mode=True, audio_source=audio_source)
+
+    @traced("Game.handle_input")
     def handle_input(self):
         """
         tangani event dari keybord atau mouse, ambil frame dari webcam, dan proses input pengguna
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.is_running = False
-
-            elif event.type == pygame.KEYDOWN:
-                # Tombol spasi untuk pause/resume (hanya jika game berjalan dan belum game over)
-                if event.key == pygame.K_SPACE and self.game_started and not self.game_over:
-                    self.paused = not self.paused
-                    if self.paused:
-                        self.environment.pause()
-                        self.notification = "Permainan Dijeda. Tekan Spasi untuk Melanjutkan."
-                    else:
-                        self.environment.resume()
-                        self.notification = "Permainan Dilanjutkan!"
-
-                # Tombol 'S' dan 'Q' hanya jika belum dimulai dan belum game over
-                elif not self.game_started and not self.game_over:
-                    if event.key == pygame.K_s:
-                        self.start_game()
-                    elif event.key == pygame.K_q:
-                        self.is_running = False
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if not self.game_started and not self.game_over:
-                    pos = pygame.mouse.get_pos()
-                    for button in self.buttons:
-                        if button.is_clicked(pos):
-                            if button.text.startswith("Start"):
-                                self.start_game()
-                            elif button.text.startswith("Quit"):
-                                self.is_running = False
+        with tracer.span("Game.handle_input/events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.is_running = False
+
+                elif event.type == pygame.KEYDOWN:
+                    # Tombol spasi untuk pause/resume (hanya jika game berjalan dan belum game over)
+                    if event.key == pygame.K_SPACE and self.game_started and not self.game_over:
+                        self.paused = not self.paused
+                        if self.paused:
+                            self.environment.pause()
+                            self.notification = "Permainan Dijeda. Tekan Spasi untuk Melanjutkan."
+                        else:
+                            self.environment.resume()
+                            self.notification = "Permainan Dilanjutkan!"
+
+                    # Tombol 'S', 'Q', dan 'C' (ganti karakter) hanya jika belum dimulai dan belum game over
+                    elif not self.game_started and not self.game_over:
+                        if event.key == pygame.K_s:
+                            self.start_game()
+                        elif event.key == pygame.K_q:
+                            self.is_running = False
+                        elif event.key == pygame.K_c and len(self.skins.names) > 1:
+                            self.notification = f"Karakter: {self.player.cycle_skin()}\nTekan 'S' untuk memulai"
 
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if not self.game_started and not self.game_over:
+                        pos = pygame.mouse.get_pos()
+                        for button in self.buttons:
+                            if button.is_clicked(pos):
+                                if button.text.startswith("Start"):
+                                    self.start_game()
+                                elif button.text.startswith("Quit"):
+                                    self.is_running = False
 
         # Ambil frame dari webcam dan proses landmark tubuh
-        ret, frame = self.cap.read()
+        with tracer.span("Game.handle_input/capture"):
+            ret, frame = self.cap.read()
+        # Waktu menunggu frame kamera berikutnya (CameraCapture); cv2.VideoCapture tidak melaporkannya
+        self._tick_capture_time += getattr(self.cap, "last_wait_time", 0.0)
         if not ret:
             print("Gagal mengambil frame dari webcam.")
             self.is_running = False
             return None, None
 
-        frame = cv2.blur(frame, (5, 5))
+        if self.blur_enabled:
+            with tracer.span("Game.handle_input/blur"):
+                frame = cv2.blur(frame, (5, 5))
         results = self.input_handler.process_frame(frame)
         return frame, results
 
+    def apply_quality_tier(self, tier):
+        """
+        Menerapkan tingkat kualitas ke komponen game. Skala render hanya berlaku
+        saat Visualizer dibuat (ronde berikutnya), pengaturan lain langsung berlaku.
+        """
+        self.blur_enabled = tier.blur
+        self.draw_landmarks_enabled = tier.draw_landmarks
+        self.visualizer.webcam_scale = tier.webcam_scale
+        self.input_handler.set_pose_quality(tier.pose_input_width, tier.model_complexity)
+
     def start_game(self):
         """
         Memulai game baru, reset posisi pemain dan status game
@@ -133,7 +209,7 @@ class Game:
         self.environment.reset() 
         self.environment.start_game_timer()
         self.environment.switch_to_green_light()
-        self.sound_manager.play_sound('green_light')
+        self._play_sound('green_light')
         
         self.notification = "Green Light!"
         self.user_body_sum_red_light = 0
@@ -158,128 +234,184 @@ class Game:
             self.winner = True
             self.game_over = True
             self.notification = "Selamat! Kamu Menang."
-            self.sound_manager.play_sound('win')
+            self._play_sound('win')
             return True
         if self.environment.has_game_time_elapsed():
             self.game_over = True
             self.notification = "Waktu Habis! Kamu Kalah."
-            self.sound_manager.play_sound('lose')
+            self._play_sound('lose')
             return True
         return False
 
-    def run(self):
+    def _play_sound(self, sound_name):
+        # Memutar cue suara (blocking hingga selesai) dan mencatat lamanya untuk tick ini
+        sound_start_time = time.time()
+        self.sound_manager.play_sound(sound_name)
+        self._tick_sound_time += time.time() - sound_start_time
+
+    def _update_spectrogram(self, sound_pitch):
+        # Meneruskan spektrum blok audio terakhir ke strip spectrogram di Visualizer
+        if self.input_handler.last_spectrum is not None:
+            freqs, magnitudes = self.input_handler.last_spectrum
+            self.visualizer.update_spectrogram(freqs, magnitudes, sound_pitch)
+
+    def _end_tick(self):
         """
-        Main loop dari permainan 
+        Mencatat data tick sebelumnya ke perekam telemetri dan pengatur kualitas (jika ada),
+        lalu menyiapkan tick berikutnya. Dipanggil di awal setiap iterasi game loop
+        sehingga semua cabang `continue` ikut tercatat.
         """
-        self.is_running = True # Ensure this session starts as running
-        while self.is_running:
-            frame, results = self.handle_input()
-            if not self.is_running or frame is None:
-                break
+        now = time.time()
+        if self._tick_start_time is not None:
+            frame_time = now - self._tick_start_time
+            if self.telemetry is not None:
+                self.telemetry.record(self._tick_volume, self._tick_pitch, self.environment.light_status,
+                                      self.player.x, frame_time, self._tick_visibility,
+                                      timestamp=self._tick_start_time)
+            # Waktu rekam suara (blocking 100 ms), cue suara yang menunggu hingga selesai, dan
+            # menunggu frame kamera tidak dihitung sebagai beban render; tanpa itu pengatur kualitas
+            # hanya mengukur FPS kamera dan tidak pernah bisa menaikkan kualitas
+            render_time = (frame_time - self._tick_audio_time - self._tick_sound_time
+                           - self._tick_capture_time)
+            if self.quality is not None and self.quality.record_frame(render_time):
+                self.apply_quality_tier(self.quality.tier)
+        self._tick_start_time = now
+        self._tick_audio_time = 0.0
+        self._tick_sound_time = 0.0
+        self._tick_capture_time = 0.0
+        self._tick_volume = float("nan")
+        self._tick_pitch = float("nan")
+        self._tick_visibility = float("nan")
+
+    @traced("Game.tick")
+    def tick(self):
+        """
+        Menjalankan satu iterasi game loop: ambil input, perbarui logika permainan, lalu gambar layar.
+        Game loop berhenti ketika self.is_running menjadi False.
+        """
+        self._end_tick()
+        frame, results = self.handle_input()
+        if not self.is_running or frame is None:
+            self.is_running = False
+            return
 
-            # Gambar pose Landmark
-            frame_with_landmarks = self.input_handler.draw_landmarks(frame.copy(), results)
+        # Landmark pose digambar langsung di permukaan webcam yang sudah diskalakan oleh Visualizer
+        landmarks = self.input_handler.get_landmark_array(results) if self.draw_landmarks_enabled else None
 
-            #Menampilkan halaman awal jika game belum dimulai
-            if not self.game_started:
-                self.visualizer.draw(frame_with_landmarks, self.player, self.environment,
-                                     notification=self.notification, buttons=self.buttons, game_started=False)
-                self.player.update_animation_frame()
-                continue
+        #Menampilkan halaman awal jika game belum dimulai
+        if not self.game_started:
+            self.visualizer.draw(frame, self.player, self.environment,
+                                 notification=self.notification, buttons=self.buttons, game_started=False, landmarks=landmarks)
+            self.player.update_animation_frame()
+            return
+        
+        # Jika game dijeda
+        if self.paused:
+            self.visualizer.draw(frame, self.player, self.environment,
+                                notification=self.notification, game_started=True, landmarks=landmarks)
+            self.player.update_animation_frame()
+            return
+
+        # jika game sudah selesai
+        if self.game_over:
+            self.visualizer.draw(frame, self.player, self.environment, notification=self.notification, game_started=True, landmarks=landmarks)
+            self.is_running = False
+            return
+
+        # Cek apakah tubuh bagian atas terlihat di kamera  
+        if results and results.pose_landmarks:
+            pose_landmarks = results.pose_landmarks.landmark
+            self._tick_visibility = min(pose_landmarks[11].visibility, pose_landmarks[12].visibility)
+            if not is_visible(pose_landmarks):
+                self.notification = "Silakan pastikan tubuh bagian atas terlihat di kamera"
+                self.visualizer.draw(frame, self.player, self.environment, notification=self.notification, game_started=True, landmarks=landmarks)
+                return
+            else:
+                self.notification = ""
+
+        # Logika saat lampu hijau
+        if self.environment.is_green_light():
+            if not self.paused and self.environment.is_green_light_over():
+                self.notification = "Bersiap untuk Red Light..."
+                self.red_light_delay_start_time = time.time()
+                self.environment.light_status = "transition_to_red"
+                self.visualizer.draw(frame, self.player, self.environment, notification=self.notification, game_started=True, landmarks=landmarks)
+                self._play_sound('red_light')
+                return
+
+            # Ambil volume dan pitch dari suara pengguna
+            audio_start_time = time.time()
+            sound_volume, sound_pitch  = self.input_handler.get_user_voice_volume_and_pitch()
+            self._tick_audio_time = time.time() - audio_start_time
+            self._tick_volume, self._tick_pitch = sound_volume, sound_pitch
+            self._update_spectrogram(sound_pitch)
+            # Deteksi apakah suara cukup kuat untuk bergerak
+            sound_detected = sound_volume > self.min_sound_threshold_to_move
+            # Multiplier kecepatan gabungan dari volume dan pitch (0 jika suara tidak terdeteksi)
+            # (dalam piksel resolusi penuh, jadi ikut diskalakan seperti movement_speed)
+            sound_speed_multiplier = float(calculate_speed_multiplier(sound_volume, sound_pitch,
+                                                                      self.min_sound_threshold_to_move, self.max_sound_volume))
+            sound_speed_multiplier *= self.visualizer.render_scale
+
+            # Set kecepatan gerak dasar
+            current_movement_speed = self.movement_speed
             
-            # Jika game dijeda
-            if self.paused:
-                self.visualizer.draw(frame_with_landmarks, self.player, self.environment,
-                                    notification=self.notification, game_started=True)
+            # Jika suara terdeteksi, gerakan karakter
+            if not self.paused and sound_detected:
+                current_movement_speed += sound_speed_multiplier
+                self.notification = f"Gerak! Suara terdeteksi: {sound_volume:.2f}, Pitch: {sound_pitch:.2f} Hz"
+                self.player.move(current_movement_speed, self.environment.finish_line_x)
+                self.player.update_animation_frame()
+            else:
+                self.notification = "Bersuara untuk Maju!"
                 self.player.update_animation_frame()
-                continue
-
-            # jika game sudah selesai
-            if self.game_over:
-                self.visualizer.draw(frame_with_landmarks, self.player, self.environment, notification=self.notification, game_started=True)
-                self.is_running = False
-                continue
-
-            # Cek apakah tubuh bagian atas terlihat di kamera  
-            if results and results.pose_landmarks:
-                if not is_visible(results.pose_landmarks.landmark):
-                    self.notification = "Silakan pastikan tubuh bagian atas terlihat di kamera"
-                    self.visualizer.draw(frame_with_landmarks, self.player, self.environment, notification=self.notification, game_started=True)
-                    continue
-                else:
-                    self.notification = ""
-
-            # Logika saat lampu hijau
-            if self.environment.is_green_light():
-                if not self.paused and self.environment.is_green_light_over():
-                    self.notification = "Bersiap untuk Red Light..."
-                    self.red_light_delay_start_time = time.time()
-                    self.environment.light_status = "transition_to_red"
-                    self.visualizer.draw(frame_with_landmarks, self.player, self.environment, notification=self.notification, game_started=True)
-                    self.sound_manager.play_sound('red_light')
-                    continue
-
-                # Ambil volume dan pitch dari suara pengguna
-                sound_volume, sound_pitch  = self.input_handler.get_user_voice_volume_and_pitch()
-                # Deteksi apakah suara cukup kuat untuk bergerak
-                sound_detected = sound_volume > self.min_sound_threshold_to_move
-                # Default multiplier 
-                sound_speed_multiplier = 0.0
-                
-                if sound_detected:
-                   # Normalisasi volume ke rentang [0.0, 1.5]
-                    normalized_volume = min(1.5, (sound_volume - self.min_sound_threshold_to_move) / (self.max_sound_volume - self.min_sound_threshold_to_move))
-
-                    # Gunakan pitch untuk mempengaruhi multiplier, misalnya pitch 100–800 Hz → 0–5
-                    pitch_multiplier = min(5.0, max(0.0, (sound_pitch - 100) / 140))  # normalisasi pitch ke 0-5
-
-                    # Total multiplier gabungan dari volume dan pitch
-                    sound_speed_multiplier = normalized_volume * pitch_multiplier
-                    
-                # Set kecepatan gerak dasar
-                current_movement_speed = self.movement_speed
                 
-                # Jika suara terdeteksi, gerakan karakter
-                if not self.paused and sound_detected:
-                    current_movement_speed += sound_speed_multiplier
-                    self.notification = f"Gerak! Suara terdeteksi: {sound_volume:.2f}, Pitch: {sound_pitch:.2f} Hz"
-                    self.player.move(current_movement_speed, self.environment.finish_line_x)
-                    self.player.update_animation_frame()
+        elif self.environment.light_status == "transition_to_red":
+            # Transisi dari hijau ke merah
+            if (time.time() - self.red_light_delay_start_time) >= 0.5:
+                self.environment.switch_to_red_light()
+                self.notification = "Red Light! Jangan Bersuara!"
+            else:
+                self.notification = "Bersiap untuk Red Light..."
+
+        elif self.environment.is_red_light():
+            if not self.paused and self.environment.is_red_light_over():
+                self.environment.switch_to_green_light()
+                self._play_sound('green_light')
+                self.notification = "Green Light!"
+            else:
+                audio_start_time = time.time()
+                sound_volume, sound_pitch = self.input_handler.get_user_voice_volume_and_pitch()
+                self._tick_audio_time = time.time() - audio_start_time
+                self._tick_volume, self._tick_pitch = sound_volume, sound_pitch
+                self._update_spectrogram(sound_pitch)
+                sound_detected_red_light = sound_volume > self.min_sound_threshold_to_move
+
+                if not self.paused and sound_detected_red_light:
+                    self.game_over = True
+                    self.eliminated_in_red = True
+                    self.notification = f"Kamu Kalah: Bersuara (Volume: {sound_volume:.2f}, Pitch: {sound_pitch:.2f} Hz)"
+                    self._play_sound('lose')
+                    print(self.notification)
                 else:
-                    self.notification = "Bersuara untuk Maju!"
-                    self.player.update_animation_frame()
-                    
-            elif self.environment.light_status == "transition_to_red":
-                # Transisi dari hijau ke merah
-                if (time.time() - self.red_light_delay_start_time) >= 0.5:
-                    self.environment.switch_to_red_light()
                     self.notification = "Red Light! Jangan Bersuara!"
-                else:
-                    self.notification = "Bersiap untuk Red Light..."
-
-            elif self.environment.is_red_light():
-                if not self.paused and self.environment.is_red_light_over():
-                    self.environment.switch_to_green_light()
-                    self.sound_manager.play_sound('green_light')
-                    self.notification = "Green Light!"
-                else:
-                    sound_volume, sound_pitch = self.input_handler.get_user_voice_volume_and_pitch()
-                    sound_detected_red_light = sound_volume > self.min_sound_threshold_to_move
 
-                    if not self.paused and sound_detected_red_light:
-                        self.game_over = True
-                        self.notification = f"Kamu Kalah: Bersuara (Volume: {sound_volume:.2f}, Pitch: {sound_pitch:.2f} Hz)"
-                        self.sound_manager.play_sound('lose')
-                        print(self.notification)
-                    else:
-                        self.notification = "Red Light! Jangan Bersuara!"
+        self.player.update_animation_frame()
+        self.check_win_lose_conditions(time.time())
 
-            self.player.update_animation_frame()
-            self.check_win_lose_conditions(time.time())
+        self.visualizer.draw(frame, self.player, self.environment, notification=self.notification, game_started=True, landmarks=landmarks)
 
-            self.visualizer.draw(frame_with_landmarks, self.player, self.environment, notification=self.notification, game_started=True)
+    def run(self):
+        """
+        Main loop dari permainan 
+        """
+        self.is_running = True # Ensure this session starts as running
+        while self.is_running:
+            self.tick()
 
+        self._end_tick()
         self.cap.release()
+        self.input_handler.close()
         
         play_again = False
 
@@ -295,9 +427,33 @@ class Game:
                                                   restart_button=self.play_again_button,
                                                   exit_button=self.exit_button)
 
+        # Siapkan instant replay jika pemain tereliminasi karena bersuara saat lampu merah
+        replay_frames = 0
+        if self.replay is not None:
+            self.replay.stop()
+            if self.eliminated_in_red:
+                replay_frames = len(self.replay)
+                replay_durations = self.replay.get_frame_durations()
+                if replay_frames and self.replay_export_dir:
+                    os.makedirs(self.replay_export_dir, exist_ok=True)
+                    self.replay.export_mp4(os.path.join(self.replay_export_dir,
+                                                        time.strftime("replay_%Y%m%d_%H%M%S.mp4")))
+        replay_index = 0
+        clock = pygame.time.Clock()
+
         # Tunggu input pengguna di layar akhir
         waiting_for_choice = True
         while waiting_for_choice:
+            # Putar replay berulang-ulang di atas pesan hasil
+            if replay_frames:
+                frame_index = replay_index % replay_frames
+                self.visualizer.draw_replay_frame(self.replay.decode_frame(frame_index))
+                replay_index += 1
+                # Putar dengan jeda yang sama seperti saat direkam agar kecepatannya sesuai aslinya
+                clock.tick(1.0 / max(replay_durations[frame_index], 1e-3))
+            else:
+                clock.tick(30)
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     waiting_for_choice = False
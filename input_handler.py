@@ -3,19 +3,104 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import sounddevice as sd
+import os
 from scipy.signal import butter, lfilter
 
+from pose_tracker import PoseTracker
+from spectral_features import SpectralAnalyzer
+from tracing import tracer, traced
+
+# File model landmark pose per kompleksitas di dalam paket mediapipe. Hanya model "full" yang
+# dibundel; lite dan heavy diunduh oleh mp.solutions.pose.Pose saat pertama kali dibuat.
+POSE_LANDMARK_MODELS = {
+    0: "pose_landmark_lite.tflite",
+    1: "pose_landmark_full.tflite",
+    2: "pose_landmark_heavy.tflite",
+}
+
 class InputHandler:
     """
     kelas untuk menangani input video dan audio, mendeteksi pose manusia,
     """
-    def __init__(self):
+    def __init__(self, keyframe_mode=False, model_complexity=1, pose_input_width=None, audio_source=None):
         # Inisialisasi MediaPipe Pose untuk mendeteksi pose manusia
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        self.model_complexity = model_complexity
+        self.pose = self._create_pose_model(model_complexity)
         self.drawing = mp.solutions.drawing_utils
+        # Pasangan indeks landmark yang dihubungkan garis, sebagai array (M, 2) untuk overlay tervektorisasi
+        self.pose_connections = np.array(sorted(self.mp_pose.POSE_CONNECTIONS), dtype=np.intp)
+
+        # Lebar frame untuk inferensi pose (None = gunakan resolusi kamera penuh)
+        self.pose_input_width = pose_input_width
+
+        # Sumber audio: fungsi (jumlah_sampel, fs) -> array float32 1D; None = rekam dari mikrofon.
+        # Method milik sendiri tidak disimpan di atribut agar tidak terbentuk siklus referensi
+        self.audio_source = audio_source
+
+        # Spektrum (frekuensi, magnitudo) dari blok audio terakhir, dipakai untuk spectrogram di Visualizer
+        self.last_spectrum = None
+
+        # Analyzer fitur spektral (dibuat saat blok pertama) dan fitur dari blok audio terakhir
+        self.spectral_analyzer = None
+        self.last_features = None
+
+        # Mode keyframe: inferensi penuh setiap K frame, landmark di antaranya dilacak dengan optical flow
+        self.tracker = PoseTracker() if keyframe_mode else None
+
+    def _create_pose_model(self, model_complexity):
+        # Membuat model pose MediaPipe (API solutions lama yang sinkron)
+        return self.mp_pose.Pose(model_complexity=model_complexity,
+                                 min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    def _pose_model_available(self, model_complexity):
+        # Hanya model yang sudah ada di disk; membuat Pose untuk model yang belum ada akan
+        # mengunduhnya secara blocking di tengah permainan
+        model_dir = os.path.join(os.path.dirname(mp.__file__), "modules", "pose_landmark")
+        filename = POSE_LANDMARK_MODELS.get(model_complexity)
+        return filename is not None and os.path.exists(os.path.join(model_dir, filename))
 
+    def close(self):
+        # Melepaskan sumber daya model pose
+        self.pose.close()
+
+    def set_pose_quality(self, pose_input_width, model_complexity):
+        # Mengubah resolusi inferensi pose dan kompleksitas model (dipakai oleh QualityController)
+        self.pose_input_width = pose_input_width
+        if model_complexity != self.model_complexity:
+            # Periksa dulu sebelum model lama ditutup; jika tidak ada, tetap pakai model yang sedang berjalan
+            if not self._pose_model_available(model_complexity):
+                print(f"Peringatan: model pose untuk kompleksitas {model_complexity} tidak tersedia, "
+                      f"tetap memakai kompleksitas {self.model_complexity}.")
+                return
+            # Model baru dibuat sebelum model lama ditutup agar kegagalan tidak meninggalkan handler tanpa model
+            try:
+                pose = self._create_pose_model(model_complexity)
+            except Exception as e:
+                print(f"Peringatan: gagal memuat model pose kompleksitas {model_complexity} ({e}), "
+                      f"tetap memakai kompleksitas {self.model_complexity}.")
+                return
+            self.close()
+            self.model_complexity = model_complexity
+            self.pose = pose
+            if self.tracker is not None:
+                self.tracker.reset()
+
+    @traced("InputHandler.process_frame")
     def process_frame(self, frame):
+        # Perkecil frame sesuai resolusi inferensi; landmark MediaPipe ternormalisasi sehingga tetap valid
+        height, width = frame.shape[:2]
+        if self.pose_input_width and width > self.pose_input_width:
+            scale = self.pose_input_width / width
+            frame = cv2.resize(frame, (self.pose_input_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+        # Memproses frame lewat tracker (mode keyframe) atau inferensi penuh di setiap frame
+        if self.tracker is not None:
+            return self.tracker.process(frame, self._infer_pose)
+        return self._infer_pose(frame)
+
+    @traced("InputHandler.process_frame/inference")
+    def _infer_pose(self, frame):
         # mengubah frame dari BGR ke RGB untuk MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.pose.process(rgb_frame)
@@ -27,7 +112,14 @@ class InputHandler:
             self.drawing.draw_landmarks(frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS)
         return frame
 
-    def _butter_bandpass(self, lowcut, highcut, fs, order=5):
+    def get_landmark_array(self, results):
+        # Mengubah landmark pose menjadi array (N, 3) berisi x, y ternormalisasi dan visibility
+        if not results or not results.pose_landmarks:
+            return None
+        return np.array([(lm.x, lm.y, lm.visibility) for lm in results.pose_landmarks.landmark], dtype=np.float32)
+
+    @staticmethod
+    def _butter_bandpass(lowcut, highcut, fs, order=5):
         # Membuat koefisien filter band-pass Butterworth, digunakan untuk menyaring frekuensi audio
         nyq = 0.5 * fs
         low = lowcut / nyq
@@ -35,40 +127,60 @@ class InputHandler:
         b, a = butter(order, [low, high], btype='band')
         return b, a
 
-    def _butter_bandpass_filter(self, data, lowcut, highcut, fs, order=5):
-        # Menerapkan filter band-pass Butterworth pada data audio
-        b, a = self._butter_bandpass(lowcut, highcut, fs, order=order)
-        y = lfilter(b, a, data)
+    @staticmethod
+    def _butter_bandpass_filter(data, lowcut, highcut, fs, order=5):
+        # Menerapkan filter band-pass Butterworth pada data audio (sepanjang sumbu terakhir)
+        b, a = InputHandler._butter_bandpass(lowcut, highcut, fs, order=order)
+        y = lfilter(b, a, data, axis=-1)
         return y
 
-    def detect_pitch_fft(self, audio_data, fs):
+    @staticmethod
+    def detect_pitch_fft(audio_data, fs):
         # Menggunakan FFT untuk mendeteksi frekuensi dominan dari data audio.
-        audio_data -= np.mean(audio_data)  
-        window = np.hamming(len(audio_data))
+        # Menerima satu blok (1D) atau banyak blok sekaligus (2D, satu blok per baris).
+        audio_data = audio_data - np.mean(audio_data, axis=-1, keepdims=True)
+        window = np.hamming(audio_data.shape[-1])
         windowed_data = audio_data * window
 
-        spectrum = np.fft.rfft(windowed_data)
-        freqs = np.fft.rfftfreq(len(windowed_data), d=1.0/fs)
+        spectrum = np.fft.rfft(windowed_data, axis=-1)
+        freqs = np.fft.rfftfreq(windowed_data.shape[-1], d=1.0/fs)
         magnitudes = np.abs(spectrum)
 
-        peak_index = np.argmax(magnitudes)
+        peak_index = np.argmax(magnitudes, axis=-1)
         dominant_freq = freqs[peak_index]
-
         return dominant_freq
 
+    def _record_microphone(self, num_samples, fs):
+        # Merekam suara dari mikrofon (blocking) dan mengembalikan satu kanal
+        audio = sd.rec(num_samples, samplerate=fs, channels=1, dtype='float32')
+        sd.wait()
+        return audio[:, 0] if audio.ndim > 1 else audio
+
+    @traced("InputHandler.get_user_voice_volume_and_pitch")
     def get_user_voice_volume_and_pitch(self, lowcut=128.0, highcut=1024.0, fs=44100, order=5):
         # Merekam suara pengguna dan menghitung volume serta pitch
         try:
             duration = 0.1  # 100 ms
-            audio = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='float32')
-            sd.wait()
+            with tracer.span("InputHandler.get_user_voice_volume_and_pitch/record"):
+                record = self.audio_source if self.audio_source else self._record_microphone
+                audio_data = record(int(duration * fs), fs)
 
-            audio_data = audio[:, 0] if audio.ndim > 1 else audio
+            with tracer.span("InputHandler.get_user_voice_volume_and_pitch/analysis"):
+                # Semua fitur (RMS, pitch, centroid, energi pita, harmonicity, flux) dari satu rFFT
+                analyzer = self._get_spectral_analyzer(len(audio_data), fs, lowcut, highcut, order)
+                features, freqs, magnitudes = analyzer.analyze(audio_data, return_spectrum=True)
+            self.last_spectrum = (freqs, magnitudes)
+            self.last_features = features
 
-            filtered_audio = self._butter_bandpass_filter(audio_data, lowcut, highcut, fs, order=order)
-            rms = np.sqrt(np.mean(filtered_audio**2))
-            pitch = self.detect_pitch_fft(filtered_audio, fs)
-
-            return rms, pitch
+            return float(features["rms"]), float(features["pitch"])
         except Exception as e:
+            self.last_spectrum = None
+            self.last_features = None
             return 0.0, 0.0
+
+    def _get_spectral_analyzer(self, block_size, fs, lowcut, highcut, order):
+        # Membuat ulang analyzer hanya jika ukuran blok atau parameter filter berubah
+        config = (block_size, fs, lowcut, highcut, order)
+        if self.spectral_analyzer is None or self.spectral_analyzer.config != config:
+            self.spectral_analyzer = SpectralAnalyzer(block_size, fs=fs, lowcut=lowcut, highcut=highcut, order=order)
+        return self.spectral_analyzer
@@ -0,0 +1,199 @@
+import argparse
+import os
+import time
+import numpy as np
+
+from capture import CameraCapture, SyntheticFrameSource
+
+
+class BurstAudioSource:
+    """
+    Sumber audio pengganti mikrofon yang menyisipkan ledakan nada (burst) bertimestamp.
+    Setiap panggilan berlangsung selama durasi blok (seperti sd.rec + sd.wait), dan
+    sampel diisi nada jika rentang waktu blok tersebut bertumpang tindih dengan burst.
+    """
+    def __init__(self, interval=1.0, burst_duration=0.3, amplitude=0.2, pitch=300.0, seed=0):
+        """
+        Parameters:
+            interval (float): Jeda antara akhir satu burst dan awal burst berikutnya (detik).
+            burst_duration (float): Lama setiap burst (detik).
+            amplitude (float): Amplitudo nada burst.
+            pitch (float): Frekuensi nada burst (Hz).
+            seed (int): Seed untuk jitter jadwal dan noise.
+        """
+        self.interval = interval
+        self.burst_duration = burst_duration
+        self.amplitude = amplitude
+        self.pitch = pitch
+        self.rng = np.random.default_rng(seed)
+        self.onsets = []  # Waktu mulai (time.perf_counter) setiap burst yang sudah dijadwalkan
+        self.next_onset = None
+
+    def schedule_next(self, after):
+        # Jadwalkan burst berikutnya dengan jitter agar tidak selalu sefase dengan blok audio
+        self.next_onset = after + self.interval + self.rng.uniform(0.0, 0.1)
+        self.onsets.append(self.next_onset)
+
+    def __call__(self, num_samples, fs):
+        block_start = time.perf_counter()
+        block_duration = num_samples / fs
+        if self.next_onset is None:
+            self.schedule_next(block_start)
+
+        t = block_start + np.arange(num_samples) / fs
+        audio = self.rng.normal(0.0, 0.001, num_samples).astype(np.float32)
+        onset = self.next_onset
+        active = (t >= onset) & (t < onset + self.burst_duration)
+        if active.any():
+            audio[active] += self.amplitude * np.sin(2 * np.pi * self.pitch * (t[active] - onset))
+        if block_start + block_duration >= onset + self.burst_duration:
+            self.schedule_next(onset + self.burst_duration)
+
+        # Tunggu hingga "rekaman" selesai, seperti mikrofon asli
+        remaining = block_start + block_duration - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        return audio
+
+
+class LatencyProbe:
+    """
+    Mengukur latensi dari awal burst suara hingga:
+        - capture: get_user_voice_volume_and_pitch mengembalikan volume di atas ambang batas
+        - decision: Game memutuskan (Player.move dipanggil, atau suara 'lose' mulai diputar setelah game_over)
+        - display: Visualizer.draw selesai menampilkan frame yang memuat hasil keputusan
+    """
+    def __init__(self, game, source):
+        self.game = game
+        self.source = source
+        self.records = []          # (mode, capture, decision, display) dalam detik
+        self._pending = None       # dict untuk burst yang sedang dilacak
+        self._handled_onsets = set()
+        self.mode = "green"
+        self._wrap_methods()
+
+    def _wrap_methods(self):
+        # Membungkus method instance (bukan kelas) untuk mencatat timestamp setiap tahap
+        game = self.game
+        original_voice = game.input_handler.get_user_voice_volume_and_pitch
+        original_move = game.player.move
+        original_draw = game.visualizer.draw
+        original_play_sound = game.sound_manager.play_sound
+
+        def voice(*args, **kwargs):
+            volume, pitch = original_voice(*args, **kwargs)
+            now = time.perf_counter()
+            onset = self._current_onset(now)
+            if (onset is not None and self._pending is None and onset not in self._handled_onsets
+                    and volume > game.min_sound_threshold_to_move):
+                self._handled_onsets.add(onset)
+                self._pending = {"onset": onset, "capture": now - onset}
+            return volume, pitch
+
+        def move(*args, **kwargs):
+            result = original_move(*args, **kwargs)
+            self._mark_decision()
+            return result
+
+        def play_sound(sound_name):
+            # Suara 'lose' diputar tepat setelah game_over diset karena bersuara saat lampu merah
+            if sound_name == 'lose':
+                self._mark_decision()
+            return original_play_sound(sound_name)
+
+        def draw(*args, **kwargs):
+            result = original_draw(*args, **kwargs)
+            pending = self._pending
+            if pending is not None and "decision" in pending:
+                self.records.append((self.mode, pending["capture"], pending["decision"],
+                                     time.perf_counter() - pending["onset"]))
+                self._pending = None
+            return result
+
+        game.input_handler.get_user_voice_volume_and_pitch = voice
+        game.player.move = move
+        game.visualizer.draw = draw
+        game.sound_manager.play_sound = play_sound
+
+    def _current_onset(self, now):
+        # Burst terakhir yang sudah dimulai sebelum `now`
+        started = [onset for onset in self.source.onsets if onset <= now]
+        return started[-1] if started else None
+
+    def _mark_decision(self):
+        if self._pending is not None and "decision" not in self._pending:
+            self._pending["decision"] = time.perf_counter() - self._pending["onset"]
+
+    def run_green(self, bursts):
+        # Lampu hijau terus-menerus dan garis finish tak terjangkau: setiap burst menggerakkan pemain
+        game = self.game
+        self.mode = "green"
+        game.environment.green_duration_range = (3600, 3601)
+        game.environment.game_duration_range = (7200, 7201)
+        game.start_game()
+        game.environment.finish_line_x = float("inf")
+        target = len(self.records) + bursts
+        while game.is_running and len(self.records) < target:
+            game.tick()
+
+    def run_red(self, bursts):
+        # Lampu merah terus-menerus: setiap burst mengeliminasi pemain, lalu permainan dipulihkan
+        game = self.game
+        self.mode = "red"
+        game.environment.red_duration_range = (3600, 3601)
+        target = len(self.records) + bursts
+        while len(self.records) < target:
+            game.game_over = False
+            game.is_running = True
+            game.environment.switch_to_red_light()
+            while game.is_running and not game.game_over:
+                game.tick()
+            if not game.game_over:
+                break  # Game berhenti karena alasan lain (mis. kamera gagal)
+
+    def report(self):
+        # Mencetak distribusi latensi per mode dalam milidetik
+        for mode in ("green", "red"):
+            rows = np.array([r[1:] for r in self.records if r[0] == mode])
+            if len(rows) == 0:
+                continue
+            print(f"\nMode '{mode}' ({len(rows)} burst), latensi dari awal suara (ms):")
+            print(f"  {'tahap':<10}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}")
+            for column, stage in enumerate(("capture", "decision", "display")):
+                values = rows[:, column] * 1000
+                p50, p90, p99 = np.percentile(values, [50, 90, 99])
+                print(f"  {stage:<10}{p50:8.1f}{p90:8.1f}{p99:8.1f}{values.max():8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur latensi suara -> gerakan/eliminasi secara end-to-end.")
+    parser.add_argument("--bursts", type=int, default=30, help="Jumlah burst per mode")
+    parser.add_argument("--interval", type=float, default=1.0, help="Jeda antar burst (detik)")
+    parser.add_argument("--camera", action="store_true", help="Gunakan webcam asli alih-alih kamera sintetis")
+    parser.add_argument("--headless", action="store_true", help="Jalankan tanpa jendela dan perangkat audio")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    from game import Game
+
+    source = BurstAudioSource(interval=args.interval)
+    capture = None if args.camera else CameraCapture(SyntheticFrameSource())
+    game = Game(capture=capture, audio_source=source)
+    if not game.is_running:
+        return
+
+    probe = LatencyProbe(game, source)
+    probe.run_green(args.bursts)
+    probe.run_red(args.bursts)
+    game.cap.release()
+    game.input_handler.close()
+    pygame.quit()
+    probe.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,44 @@
+import os
 import pygame #import pygame untuk mengakses fungsi pygame
 
 #import class Game dari file game.py
 from game import Game
+from telemetry import TelemetryRecorder
+from quality import QualityController
+from tracing import tracer
 
 #titik masuk untuk program
 if __name__ == '__main__':
+    # Tracing opsional: set MULMET_TRACE=trace.json untuk merekam span game loop (Chrome Trace / Perfetto)
+    trace_path = os.environ.get("MULMET_TRACE")
+    if trace_path:
+        tracer.enable()
+
+    # Backend pose opsional: set MULMET_POSE_BACKEND=live_stream untuk MediaPipe Tasks PoseLandmarker
+    # (butuh file assets/pose_landmarker_*.task; jika tidak ada, kembali ke backend 'legacy')
+    pose_backend = os.environ.get("MULMET_POSE_BACKEND", "legacy")
+
+    # Ekspor instant replay opsional: set MULMET_REPLAY_DIR=replays untuk menyimpan replay eliminasi sebagai MP4
+    replay_dir = os.environ.get("MULMET_REPLAY_DIR")
+
     play_again = True # flag untuk menentukan apakah permainan akan diulang
+    skin = "mario" # skin karakter yang dipilih, terbawa antar ronde
+    telemetry = TelemetryRecorder(output_dir="telemetry") # satu perekam telemetri untuk seluruh sesi
+    quality = QualityController(target_fps=24) # pengatur kualitas adaptif, tingkatnya terbawa antar ronde
     # loop untuk menjalankan permainan
     while play_again:
-        game = Game() # buat instance dari class Game
+        game = Game(telemetry=telemetry, quality=quality, pose_backend=pose_backend, skin=skin,
+                    replay_export_dir=replay_dir) # buat instance dari class Game
         #Loop utama program - akan terus berjalan selama permainan masih berjalan
         if game.is_running:
             # Jalankan game, yang akan mengatur semua aspek permainan
             play_again = game.run() 
+            skin = game.player.skin_name
         else: 
             # Jika permainan tidak berjalan, setel play_again ke False
             play_again = False # Don't try to play again
 
+    telemetry.close() # tulis sisa telemetri sebelum keluar
+    if trace_path:
+        tracer.dump(trace_path)
     pygame.quit() #setelah semua permainan selesai, keluar dari pygame
\ No newline at end of file
@@ -0,0 +1,286 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from input_handler import InputHandler
+from spectral_features import SpectralAnalyzer
+
+FS = 44100
+BLOCK_SIZE = 4410          # 100 ms, sama seperti InputHandler.get_user_voice_volume_and_pitch
+LOWCUT, HIGHCUT = 128.0, 1024.0
+MIN_PITCH, MAX_PITCH = 60.0, 1100.0
+
+# Toleransi RMS SpectralAnalyzer terhadap RMS domain waktu lama (lfilter) di sekitar ambang gerak:
+# persentil ke-99 |rasio - 1| per blok dan |median rasio - 1|
+MOVE_THRESHOLD = 0.01
+RMS_TOLERANCE = 0.10
+RMS_MEDIAN_TOLERANCE = 0.03
+
+# RMS pita lebar derau putih untuk jenis "noise" (tanpa suara). Hanya sekitar seperlima energinya
+# yang lolos band-pass, jadi RMS terukur baru mendekati MOVE_THRESHOLD pada level 0.05
+NOISE_LEVELS = (0.01, 0.02, 0.05, 0.1)
+
+
+def generate_corpus(n_per_kind=200, snrs_db=(np.inf, 20.0, 10.0, 0.0), seed=0, noise_levels=NOISE_LEVELS):
+    """
+    Membuat korpus sinyal sintetis berlabel, satu blok per baris.
+
+    Jenis sinyal:
+        - tone: nada murni
+        - harmonic: suara harmonis (harmonik 1-6, amplitudo 1/k)
+        - missing_fundamental: suara harmonis tanpa harmonik pertama (f0 tetap menjadi label)
+        - chirp: sapuan linear f0 -> 1.2 * f0 (label = frekuensi rata-rata)
+        - noise: derau putih tanpa suara di setiap level noise_levels (true_pitch = NaN, snr_db = -inf)
+
+    Returns:
+        tuple: (blocks, labels) dengan blocks berukuran (N, BLOCK_SIZE) dan labels berupa DataFrame
+        berisi kind, snr_db, true_pitch, true_rms, dan noise_level (NaN untuk sinyal bersuara).
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(BLOCK_SIZE) / FS
+    blocks, rows = [], []
+
+    for kind in ("tone", "harmonic", "missing_fundamental", "chirp"):
+        low = 150.0 if kind == "tone" else 90.0
+        f0 = np.exp(rng.uniform(np.log(low), np.log(700.0 if kind == "tone" else 400.0), n_per_kind))
+        phases = rng.uniform(0, 2 * np.pi, (n_per_kind, 6))
+        amplitude = rng.uniform(0.02, 0.3, n_per_kind)
+
+        if kind == "tone":
+            clean = np.sin(2 * np.pi * f0[:, None] * t + phases[:, :1])
+            label = f0
+        elif kind == "chirp":
+            sweep = f0[:, None] * (t + 0.1 * t ** 2 / t[-1])  # Frekuensi sesaat f0 * (1 + 0.2 t / T)
+            clean = np.sin(2 * np.pi * sweep + phases[:, :1])
+            label = f0 * 1.1
+        else:
+            first = 2 if kind == "missing_fundamental" else 1
+            clean = sum(np.sin(2 * np.pi * k * f0[:, None] * t + phases[:, k - 1:k]) / k for k in range(first, 7))
+            label = f0
+        clean = amplitude[:, None] * clean / np.sqrt(np.mean(clean ** 2, axis=1, keepdims=True)) / np.sqrt(2)
+        true_rms = np.sqrt(np.mean(clean ** 2, axis=1))
+
+        for snr_db in snrs_db:
+            if np.isinf(snr_db):
+                noisy = clean
+            else:
+                noise_rms = true_rms / (10 ** (snr_db / 20))
+                noisy = clean + rng.normal(0, 1, clean.shape) * noise_rms[:, None]
+            blocks.append(noisy.astype(np.float32))
+            rows.append(pd.DataFrame({"kind": kind, "snr_db": snr_db, "true_pitch": label, "true_rms": true_rms,
+                                      "noise_level": np.nan}))
+
+    for level in noise_levels:
+        noise = rng.normal(0, level, (n_per_kind, BLOCK_SIZE))
+        blocks.append(noise.astype(np.float32))
+        rows.append(pd.DataFrame({"kind": "noise", "snr_db": -np.inf, "true_pitch": np.nan,
+                                  "true_rms": np.sqrt(np.mean(noise ** 2, axis=1)), "noise_level": level}))
+
+    return np.concatenate(blocks), pd.concat(rows, ignore_index=True)
+
+
+def _bandpass(blocks):
+    # Filter band-pass per blok seperti jalur live (state filter mulai dari nol di setiap blok)
+    return InputHandler._butter_bandpass_filter(blocks, LOWCUT, HIGHCUT, FS)
+
+
+def _parabolic_offset(values, index):
+    # Pergeseran sub-bin puncak dari interpolasi parabola tiga titik
+    rows = np.arange(len(index))
+    left = values[rows, np.clip(index - 1, 0, values.shape[1] - 1)]
+    center = values[rows, index]
+    right = values[rows, np.clip(index + 1, 0, values.shape[1] - 1)]
+    denominator = left - 2 * center + right
+    return np.where(np.abs(denominator) > 1e-12, 0.5 * (left - right) / denominator, 0.0)
+
+
+def estimate_fft_peak(blocks):
+    # Estimator saat ini: band-pass Butterworth + puncak FFT (InputHandler.detect_pitch_fft)
+    filtered = _bandpass(blocks)
+    return InputHandler.detect_pitch_fft(filtered, FS), np.sqrt(np.mean(filtered ** 2, axis=1))
+
+
+def estimate_fft_parabolic(blocks):
+    # Puncak FFT dengan interpolasi parabola pada magnitudo log untuk resolusi sub-bin
+    filtered = _bandpass(blocks)
+    centered = filtered - filtered.mean(axis=1, keepdims=True)
+    magnitudes = np.log(np.abs(np.fft.rfft(centered * np.hamming(BLOCK_SIZE), axis=1)) + 1e-12)
+    peak = np.argmax(magnitudes, axis=1)
+    pitch = (peak + _parabolic_offset(magnitudes, peak)) * FS / BLOCK_SIZE
+    return pitch, np.sqrt(np.mean(filtered ** 2, axis=1))
+
+
+def estimate_hps(blocks, harmonics=4):
+    # Harmonic product spectrum: tahan terhadap fundamental yang hilang
+    filtered = _bandpass(blocks)
+    spectrum = np.abs(np.fft.rfft(blocks * np.hamming(BLOCK_SIZE), n=4 * BLOCK_SIZE, axis=1))
+    freqs = np.fft.rfftfreq(4 * BLOCK_SIZE, d=1.0 / FS)
+    length = spectrum.shape[1] // harmonics
+    log_product = sum(np.log(spectrum[:, ::k][:, :length] + 1e-12) for k in range(1, harmonics + 1))
+    valid = (freqs[:length] >= MIN_PITCH) & (freqs[:length] <= MAX_PITCH)
+    log_product[:, ~valid] = -np.inf
+    return freqs[np.argmax(log_product, axis=1)], np.sqrt(np.mean(filtered ** 2, axis=1))
+
+
+def estimate_autocorrelation(blocks):
+    # Autokorelasi via FFT (Wiener-Khinchin) dengan pencarian lag terbatas dan interpolasi parabola
+    filtered = _bandpass(blocks)
+    centered = blocks - blocks.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(centered, n=2 * BLOCK_SIZE, axis=1)
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2, axis=1)[:, :BLOCK_SIZE]
+    autocorr /= autocorr[:, :1] + 1e-12
+    min_lag, max_lag = int(FS / MAX_PITCH), int(FS / MIN_PITCH)
+    search = autocorr[:, min_lag:max_lag]
+    lag = np.argmax(search, axis=1)
+    lag = lag + min_lag + _parabolic_offset(search, lag)
+    return FS / lag, np.sqrt(np.mean(filtered ** 2, axis=1))
+
+
+def estimate_spectral_analyzer(blocks):
+    # SpectralAnalyzer: band-pass di domain frekuensi dan RMS via Parseval dari rFFT yang sama
+    features = SpectralAnalyzer(BLOCK_SIZE, fs=FS, lowcut=LOWCUT, highcut=HIGHCUT).analyze(blocks)
+    return features["pitch"], features["rms"]
+
+
+ESTIMATORS = {
+    "fft_peak": estimate_fft_peak,
+    "fft_parabolic": estimate_fft_parabolic,
+    "hps": estimate_hps,
+    "autocorrelation": estimate_autocorrelation,
+    "spectral_analyzer": estimate_spectral_analyzer,
+}
+
+
+def evaluate(blocks, labels, estimators=None, repeats=3):
+    """
+    Menjalankan setiap estimator pada sinyal bersuara di korpus (batch) dan mengukur akurasi serta
+    kecepatan. Blok derau tidak punya pitch dan dinilai terpisah oleh evaluate_noise.
+
+    Returns:
+        pandas.DataFrame: Metrik per estimator, jenis sinyal, dan SNR.
+    """
+    estimators = estimators or ESTIMATORS
+    voiced = (labels["kind"] != "noise").to_numpy()
+    blocks, labels = blocks[voiced], labels[voiced]
+    results = []
+    for name, estimator in estimators.items():
+        best_time = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            pitch, rms = estimator(blocks)
+            best_time = min(best_time, time.perf_counter() - start)
+
+        table = labels.copy()
+        ratio = np.where(pitch > 0, pitch / table["true_pitch"].to_numpy(), np.nan)
+        cents = 1200 * np.log2(ratio)
+        octave_distance = np.abs(cents / 1200 - np.round(cents / 1200)) * 1200
+        table["estimator"] = name
+        table["cents_error"] = np.abs(cents)
+        table["gross_error"] = ~(np.abs(cents) <= 50)
+        table["octave_error"] = (np.abs(np.round(cents / 1200)) >= 1) & (octave_distance <= 50)
+        table["rms_error"] = np.abs(rms - table["true_rms"]) / table["true_rms"]
+        table["us_per_block"] = best_time / len(blocks) * 1e6
+        results.append(table)
+
+    table = pd.concat(results, ignore_index=True)
+    return table.groupby(["estimator", "kind", "snr_db"]).agg(
+        median_cents=("cents_error", "median"),
+        gross_error_rate=("gross_error", "mean"),
+        octave_error_rate=("octave_error", "mean"),
+        rms_rel_error=("rms_error", "median"),
+        us_per_block=("us_per_block", "first"),
+    ).reset_index()
+
+
+def evaluate_noise(blocks, labels, estimators=None, threshold=MOVE_THRESHOLD):
+    """
+    Mengukur seberapa sering derau tanpa suara terbaca sebagai suara: RMS estimator di atas
+    ambang gerak berarti pemain bergerak (atau tereliminasi saat lampu merah) tanpa bersuara.
+
+    Returns:
+        pandas.DataFrame: Tingkat deteksi palsu dan median RMS terukur per estimator dan level derau.
+    """
+    estimators = estimators or ESTIMATORS
+    noise = (labels["kind"] == "noise").to_numpy()
+    blocks, labels = blocks[noise], labels[noise]
+    results = []
+    for name, estimator in estimators.items():
+        _, rms = estimator(blocks)
+        table = labels[["noise_level"]].copy()
+        table["estimator"] = name
+        table["measured_rms"] = rms
+        table["false_detection"] = rms > threshold
+        results.append(table)
+
+    table = pd.concat(results, ignore_index=True)
+    return table.groupby(["estimator", "noise_level"]).agg(
+        false_detection_rate=("false_detection", "mean"),
+        median_rms=("measured_rms", "median"),
+    ).reset_index()
+
+
+def check_rms_agreement(blocks, labels, threshold=MOVE_THRESHOLD, tolerance=RMS_TOLERANCE,
+                        median_tolerance=RMS_MEDIAN_TOLERANCE, seed=0):
+    """
+    Memastikan RMS SpectralAnalyzer (dipakai game) tetap dekat dengan RMS band-pass domain waktu
+    lama di sekitar min_sound_threshold_to_move, karena keputusan bergerak/kalah bergantung padanya.
+    Setiap blok bersuara diskalakan ulang ke RMS acak antara 0.5x dan 2x ambang batas.
+
+    Returns:
+        bool: True jika kedua toleransi terpenuhi.
+    """
+    voiced = (labels["kind"] != "noise").to_numpy()
+    blocks, labels = blocks[voiced], labels[voiced]
+    rng = np.random.default_rng(seed)
+    target_rms = threshold * rng.uniform(0.5, 2.0, len(blocks))
+    scaled = (blocks * (target_rms / labels["true_rms"].to_numpy())[:, None]).astype(np.float32)
+
+    old_rms = np.sqrt(np.mean(_bandpass(scaled) ** 2, axis=1))
+    new_rms = SpectralAnalyzer(BLOCK_SIZE, fs=FS, lowcut=LOWCUT, highcut=HIGHCUT).analyze(scaled)["rms"]
+    deviation = np.abs(new_rms / old_rms - 1.0)
+    median_deviation = abs(float(np.median(new_rms / old_rms)) - 1.0)
+    p99_deviation = float(np.percentile(deviation, 99))
+    flipped = float(np.mean((old_rms > threshold) != (new_rms > threshold)))
+
+    passed = p99_deviation <= tolerance and median_deviation <= median_tolerance
+    print(f"\nRMS SpectralAnalyzer vs lfilter (RMS {threshold * 0.5:.3f}-{threshold * 2:.3f}): "
+          f"p99 |rasio-1| = {p99_deviation:.3f} (batas {tolerance}), "
+          f"|median-1| = {median_deviation:.3f} (batas {median_tolerance}), "
+          f"keputusan ambang berbeda = {flipped:.1%} -> {'OK' if passed else 'GAGAL'}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi akurasi dan kecepatan estimator pitch dan volume.")
+    parser.add_argument("--per-kind", type=int, default=200, help="Jumlah sinyal per jenis dan SNR")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Simpan tabel metrik ke file CSV")
+    parser.add_argument("--check-rms", action="store_true",
+                        help="Hanya periksa kesesuaian RMS SpectralAnalyzer dengan RMS lama di sekitar ambang gerak")
+    args = parser.parse_args()
+
+    if args.check_rms:
+        blocks, labels = generate_corpus(args.per_kind, seed=args.seed)
+        raise SystemExit(0 if check_rms_agreement(blocks, labels) else 1)
+
+    blocks, labels = generate_corpus(args.per_kind, seed=args.seed)
+    table = evaluate(blocks, labels)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        summary = table.groupby("estimator")[["gross_error_rate", "octave_error_rate", "us_per_block"]].mean()
+        print("\nRingkasan per estimator:")
+        print(summary.sort_values("us_per_block").to_string(float_format=lambda v: f"{v:.3f}"))
+        noise_table = evaluate_noise(blocks, labels)
+        print(f"\nDeteksi palsu pada derau tanpa suara (RMS > {MOVE_THRESHOLD}):")
+        print(noise_table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        root, ext = os.path.splitext(args.output)
+        noise_table.to_csv(f"{root}_noise{ext or '.csv'}", index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,20 @@
-import numpy as np
-from utils import load_gif_frames # memuat fungsi load_gif_frames dari utils.py
+from sprites import FRAME_SIZE
 
 
 class Player:
     """
     Representasi karakter pemain dalam permainan (misalnya mario).
     """
-    def __init__(self, start_x=55, start_y=None, gif_path=None, game_area_height=550): # start_y will be calculated and set by Game
+    def __init__(self, start_x=55, start_y=None, skin_library=None, skin_name="mario", game_area_height=550): # start_y will be calculated and set by Game
         """
         Inisialisasi objek Player.
 
         Args:
             start_x (int): Posisi horizontal awal.
             start_y (int): Posisi vertikal awal (jika None, dihitung otomatis berdasarkan tinggi game area).
-            gif_path (str): Path ke file GIF animasi karakter.
+            skin_library (SkinLibrary): Koleksi skin karakter; atlas dimuat saat skin dipilih
+                (Player dibuat setelah mode tampilan diset oleh Visualizer).
+            skin_name (str): Nama skin karakter yang dipakai.
             game_area_height (int): Tinggi area permainan (untuk posisi vertikal jika start_y=None).
         """
         self.x = start_x
@@ -21,23 +22,35 @@ class Player:
         self.initial_x = start_x # posisi awal x untuk reset
         self.initial_y = start_y # posisi awal y untuk reset
 
-        self.gif_path = gif_path if gif_path else 'mario.gif' # Gunakan default path jika tidak diberikan
-        self.frames = load_gif_frames(self.gif_path) # Muat seluruh frame dari GIF animasi
+        self.skin_library = skin_library
         self.frame_index = 0 # Indeks frame saat ini dalam animasi
-        self.total_frames = len(self.frames) # Total jumlah frame dalam animasi
-        self.character_width = 0
-        self.character_height = 0
-        if self.frames:
-            self.character_height, self.character_width, _ = self.frames[0].shape
-            if start_y is None: # jika start_y tidak diberikan, atur posisi y agar karakter berada di bawah area permainan
-                self.y = game_area_height  - self.character_height 
-                self.initial_y = self.y
-
-    def get_current_frame(self):
-        # Mengembalikan frame animasi saat ini dalam format array Numpy RGBA
-        if self.frames:
-            return self.frames[self.frame_index % self.total_frames]
-        return None
+        self.set_skin(skin_name)
+        # Ukuran karakter diketahui dari ukuran frame atlas, tanpa perlu mendekode GIF
+        self.character_width, self.character_height = skin_library.frame_size if skin_library else FRAME_SIZE
+        if start_y is None: # jika start_y tidak diberikan, atur posisi y agar karakter berada di bawah area permainan
+            self.y = game_area_height  - self.character_height 
+            self.initial_y = self.y
+
+    def set_skin(self, skin_name):
+        # Mengganti skin karakter dan langsung memuat atlasnya, agar frame permainan pertama tidak
+        # menanggung biaya decode GIF dan skin bisa dipratinjau di layar awal
+        self.skin_name = skin_name
+        self.frame_index = 0
+        if self.skin_library:
+            self.skin_library.get(skin_name)
+
+    def cycle_skin(self):
+        # Berganti ke skin berikutnya di library
+        if self.skin_library:
+            self.set_skin(self.skin_library.next_name(self.skin_name))
+        return self.skin_name
+
+    def get_current_sprite(self):
+        # Mengembalikan (surface atlas, rect area frame saat ini) untuk area blit, atau None jika skin tidak tersedia
+        atlas = self.skin_library.get(self.skin_name) if self.skin_library else None
+        if atlas is None or len(atlas) == 0:
+            return None
+        return atlas.surface, atlas.frame_rects[self.frame_index % len(atlas)]
 
     def update_animation_frame(self):
         # Memperbarui indeks frame untuk animasi karakter. (bergerak ke frame berikutnya)
@@ -0,0 +1,167 @@
+import argparse
+import os
+import threading
+import time
+import cv2
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe.tasks import python as mp_tasks
+from mediapipe.tasks.python import vision
+
+from input_handler import InputHandler
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# File model PoseLandmarker untuk setiap tingkat kompleksitas (unduh dari halaman model MediaPipe)
+POSE_LANDMARKER_MODELS = {
+    0: os.path.join(BASE_DIR, "assets", "pose_landmarker_lite.task"),
+    1: os.path.join(BASE_DIR, "assets", "pose_landmarker_full.task"),
+    2: os.path.join(BASE_DIR, "assets", "pose_landmarker_heavy.task"),
+}
+
+
+class LiveStreamPoseResults:
+    """
+    Hasil PoseLandmarker yang dikonversi ke bentuk hasil API solutions lama
+    (atribut `pose_landmarks` berisi NormalizedLandmarkList), sehingga
+    utils.is_visible, utils.calculate_sum, dan draw_landmarks tetap bisa dipakai.
+    """
+    def __init__(self, pose_landmarks, timestamp_ms):
+        self.pose_landmarks = pose_landmarks
+        self.timestamp_ms = timestamp_ms
+
+
+class PoseLandmarkerInputHandler(InputHandler):
+    """
+    Backend InputHandler berbasis MediaPipe Tasks PoseLandmarker dalam mode LIVE_STREAM.
+    Frame dikirim secara asinkron (detect_async) dan hasilnya diterima lewat callback,
+    sehingga process_frame tidak menunggu inferensi selesai. MediaPipe sendiri akan
+    membuang frame jika inferensi sebelumnya belum selesai.
+    """
+    def __init__(self, keyframe_mode=False, model_complexity=1, pose_input_width=None, audio_source=None, model_path=None):
+        """
+        Parameters:
+            keyframe_mode (bool): Aktifkan pelacakan landmark di antara keyframe (lihat PoseTracker).
+            model_complexity (int): 0 (lite), 1 (full), atau 2 (heavy); menentukan file model.
+            pose_input_width (int | None): Lebar frame untuk inferensi pose.
+            audio_source (callable | None): Sumber audio pengganti mikrofon (lihat InputHandler).
+            model_path (str | None): Path file .task; jika diberikan, mengabaikan model_complexity.
+        """
+        self.model_path = model_path
+        self._lock = threading.Lock()
+        self._result_ready = threading.Condition(self._lock)
+        self._latest_results = LiveStreamPoseResults(None, -1)
+        self._last_timestamp_ms = -1
+        # Jika model untuk kompleksitas yang diminta tidak ada, mulai dengan model lain yang tersedia
+        if not self._pose_model_available(model_complexity):
+            available = [c for c in POSE_LANDMARKER_MODELS if self._pose_model_available(c)]
+            model_complexity = available[0] if available else model_complexity
+        super().__init__(keyframe_mode=keyframe_mode, model_complexity=model_complexity,
+                         pose_input_width=pose_input_width, audio_source=audio_source)
+
+    def _pose_model_path(self, model_complexity):
+        # Path file .task untuk kompleksitas tertentu (model_path eksplisit selalu diutamakan)
+        return self.model_path or POSE_LANDMARKER_MODELS.get(model_complexity, POSE_LANDMARKER_MODELS[1])
+
+    def _pose_model_available(self, model_complexity):
+        # File model .task tidak dibundel, jadi tingkat kualitas hanya boleh memakai model yang ada
+        return os.path.exists(self._pose_model_path(model_complexity))
+
+    def _create_pose_model(self, model_complexity):
+        # Membuat PoseLandmarker LIVE_STREAM dengan callback hasil asinkron
+        model_path = self._pose_model_path(model_complexity)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"File model PoseLandmarker tidak ditemukan di '{model_path}'")
+
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_pose_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_result)
+        return vision.PoseLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        # Callback dari thread MediaPipe: konversi hasil dan simpan sebagai hasil terbaru
+        pose_landmarks = None
+        if result.pose_landmarks:
+            pose_landmarks = landmark_pb2.NormalizedLandmarkList(landmark=[
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0)
+                for lm in result.pose_landmarks[0]
+            ])
+        with self._result_ready:
+            if timestamp_ms > self._latest_results.timestamp_ms:
+                self._latest_results = LiveStreamPoseResults(pose_landmarks, timestamp_ms)
+            self._result_ready.notify_all()
+
+    def _infer_pose(self, frame, timestamp_ms=None):
+        # Kirim frame secara asinkron lalu kembalikan hasil terbaru yang sudah tersedia
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        # Timestamp LIVE_STREAM harus naik secara monoton
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        self.pose.detect_async(image, timestamp_ms)
+
+        with self._lock:
+            return self._latest_results
+
+    def wait_for_result(self, timestamp_ms, timeout=1.0):
+        """
+        Menunggu hingga hasil dengan timestamp >= timestamp_ms tersedia (untuk pengujian offline).
+
+        Returns:
+            LiveStreamPoseResults: Hasil terbaru, atau hasil lama jika timeout / frame dibuang.
+        """
+        deadline = time.monotonic() + timeout
+        with self._result_ready:
+            while self._latest_results.timestamp_ms < timestamp_ms:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._result_ready.wait(remaining)
+            return self._latest_results
+
+
+def run_offline(video_path, model_path):
+    """
+    Menjalankan backend LIVE_STREAM pada video rekaman memakai timestamp dari file,
+    lalu mencetak ringkasan jumlah frame yang menghasilkan pose.
+    """
+    from utils import is_visible
+
+    handler = PoseLandmarkerInputHandler(model_path=model_path)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Error: Video tidak dapat dibuka di path '{video_path}'")
+        return
+
+    frames = detected = visible = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        timestamp_ms = int(cap.get(cv2.CAP_PROP_POS_MSEC))
+        handler._infer_pose(frame, timestamp_ms)
+        results = handler.wait_for_result(timestamp_ms)
+        frames += 1
+        if results.pose_landmarks:
+            detected += 1
+            visible += is_visible(results.pose_landmarks.landmark)
+
+    cap.release()
+    handler.close()
+    print(f"Frame: {frames}, pose terdeteksi: {detected}, tubuh bagian atas terlihat: {visible}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Uji backend PoseLandmarker LIVE_STREAM pada video rekaman.")
+    parser.add_argument("video", help="Path video rekaman (mis. MP4)")
+    parser.add_argument("--model", default=POSE_LANDMARKER_MODELS[0], help="Path file model .task")
+    args = parser.parse_args()
+    run_offline(args.video, args.model)
@@ -0,0 +1,205 @@
+import copy
+import cv2
+import numpy as np
+
+# Indeks landmark yang dipakai oleh utils.is_visible dan utils.calculate_sum
+# (bahu, siku, pergelangan tangan, dan pinggul)
+TRACKED_LANDMARKS = [11, 12, 13, 14, 15, 16, 23, 24]
+
+# Indeks bahu kiri dan kanan di dalam TRACKED_LANDMARKS
+SHOULDER_SLOTS = [0, 1]
+
+# Landmark yang tidak dilacak mengikuti pergeseran sendi terlacak terdekat (slot di TRACKED_LANDMARKS):
+# tangan mengikuti pergelangan, kaki mengikuti pinggul, wajah (dan sisanya) mengikuti kedua bahu
+ANCHOR_SLOTS = {
+    17: [4], 19: [4], 21: [4],                    # jari tangan kiri -> pergelangan kiri
+    18: [5], 20: [5], 22: [5],                    # jari tangan kanan -> pergelangan kanan
+    25: [6], 27: [6], 29: [6], 31: [6],           # kaki kiri -> pinggul kiri
+    26: [7], 28: [7], 30: [7], 32: [7],           # kaki kanan -> pinggul kanan
+}
+
+
+def build_anchor_weights(num_landmarks):
+    """
+    Membuat matriks bobot (num_landmarks, len(TRACKED_LANDMARKS)) sehingga
+    pergeseran semua landmark = bobot @ pergeseran titik terlacak.
+    """
+    weights = np.zeros((num_landmarks, len(TRACKED_LANDMARKS)), dtype=np.float32)
+    for index in range(num_landmarks):
+        if index in TRACKED_LANDMARKS:
+            slots = [TRACKED_LANDMARKS.index(index)]
+        else:
+            slots = ANCHOR_SLOTS.get(index, SHOULDER_SLOTS)
+        weights[index, slots] = 1.0 / len(slots)
+    return weights
+
+
+class TrackedPoseResults:
+    """
+    Hasil pose yang meniru bentuk hasil MediaPipe (atribut `pose_landmarks`),
+    sehingga kode lain tidak perlu membedakan hasil keyframe dan hasil propagasi.
+    """
+    def __init__(self, pose_landmarks):
+        self.pose_landmarks = pose_landmarks
+
+
+class PoseTracker:
+    """
+    Menjalankan inferensi pose penuh hanya pada keyframe, lalu memperkirakan posisi
+    landmark penting di antara keyframe menggunakan optical flow Lucas-Kanade
+    (cv2.calcOpticalFlowPyrLK) dengan cadangan prediktor kecepatan konstan.
+    Jarak antar keyframe (K) menyesuaikan otomatis dengan besar gerakan.
+    Fungsi inferensi diberikan per panggilan process() dan tidak disimpan, agar tracker
+    tidak membentuk siklus referensi dengan handler pemiliknya.
+    """
+    def __init__(self, min_interval=1, max_interval=6, motion_low=1.5, motion_high=8.0,
+                 min_visibility=0.7, max_flow_error=20.0):
+        """
+        Parameters:
+            min_interval (int): Jarak keyframe minimum (dipakai saat gerakan besar).
+            max_interval (int): Jarak keyframe maksimum (dipakai saat pengguna diam).
+            motion_low (float): Rata-rata gerakan (piksel/frame) di bawah nilai ini dianggap diam.
+            motion_high (float): Rata-rata gerakan (piksel/frame) di atas nilai ini dianggap gerakan besar.
+            min_visibility (float): Visibilitas bahu minimum agar keyframe boleh dipropagasi.
+            max_flow_error (float): Error optical flow maksimum agar hasil pelacakan sebuah titik diterima.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.motion_low = motion_low
+        self.motion_high = motion_high
+        self.min_visibility = min_visibility
+        self.max_flow_error = max_flow_error
+
+        self.interval = min_interval  # K saat ini
+        self.frames_since_keyframe = 0
+        self.force_keyframe = True
+
+        self._landmarks = None      # Salinan landmark terakhir (dimodifikasi di tempat)
+        self._prev_gray = None      # Frame grayscale sebelumnya untuk optical flow
+        self._points = None         # Posisi titik terlacak dalam piksel, bentuk (N, 1, 2)
+        self._velocity = None       # Kecepatan titik terlacak dalam piksel/frame, bentuk (N, 1, 2)
+        self._keyframe_points = None
+        self._keyframe_all = None   # Posisi semua landmark pada keyframe dalam piksel, bentuk (M, 2)
+        self._anchor_weights = None
+
+    def reset(self):
+        # Membuang state pelacakan sehingga frame berikutnya menjadi keyframe
+        self.force_keyframe = True
+        self.frames_since_keyframe = 0
+        self.interval = self.min_interval
+        self._landmarks = None
+        self._prev_gray = None
+        self._points = None
+        self._velocity = None
+        self._keyframe_points = None
+        self._keyframe_all = None
+
+    def process(self, frame, infer):
+        """
+        Memproses satu frame BGR. Mengembalikan hasil inferensi penuh pada keyframe
+        atau hasil propagasi di antara keyframe.
+
+        Parameters:
+            frame (numpy.ndarray): Frame BGR.
+            infer (callable): Fungsi inferensi pose penuh, menerima frame BGR dan mengembalikan hasil MediaPipe.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        # Ukuran frame berubah (mis. kualitas diturunkan), titik lama tidak berlaku lagi
+        if self._prev_gray is not None and self._prev_gray.shape != gray.shape:
+            self.reset()
+
+        if self.force_keyframe or self.frames_since_keyframe + 1 >= self.interval:
+            return self._keyframe(frame, gray, infer)
+
+        results = self._propagate(gray)
+        if results is None:
+            return self._keyframe(frame, gray, infer)
+        return results
+
+    def _keyframe(self, frame, gray, infer):
+        # Inferensi pose penuh dan simpan titik acuan untuk propagasi berikutnya
+        results = infer(frame)
+        steps = self.frames_since_keyframe + 1
+        self._prev_gray = gray
+        self.frames_since_keyframe = 0
+
+        if not results or not results.pose_landmarks:
+            # Tidak ada pose: tetap inferensi penuh di frame berikutnya
+            self._landmarks = None
+            self._points = None
+            self._keyframe_points = None
+            self.force_keyframe = True
+            return results
+
+        landmarks = results.pose_landmarks.landmark
+        height, width = gray.shape
+        points = np.array([[[landmarks[i].x * width, landmarks[i].y * height]] for i in TRACKED_LANDMARKS],
+                          dtype=np.float32)
+
+        # Kecepatan awal diperkirakan dari selisih dua keyframe terakhir
+        if self._keyframe_points is not None:
+            self._velocity = (points - self._keyframe_points) / steps
+        else:
+            self._velocity = np.zeros_like(points)
+        self._adapt_interval(float(np.linalg.norm(self._velocity, axis=2).mean()))
+
+        self._points = points
+        self._keyframe_points = points.copy()
+        self._landmarks = copy.deepcopy(results.pose_landmarks)
+        self._keyframe_all = np.array([(lm.x * width, lm.y * height) for lm in landmarks], dtype=np.float32)
+        if self._anchor_weights is None or len(self._anchor_weights) != len(landmarks):
+            self._anchor_weights = build_anchor_weights(len(landmarks))
+
+        # Propagasi hanya layak jika bahu terlihat jelas pada keyframe
+        shoulders_visible = all(landmarks[TRACKED_LANDMARKS[s]].visibility > self.min_visibility
+                                for s in SHOULDER_SLOTS)
+        self.force_keyframe = not shoulders_visible
+        return results
+
+    def _propagate(self, gray):
+        # Memperkirakan posisi titik terlacak dari frame sebelumnya ke frame saat ini
+        if self._landmarks is None or self._points is None:
+            return None
+
+        new_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, self._points, None, winSize=(21, 21), maxLevel=3)
+        if new_points is None:
+            return None
+
+        tracked = (status.reshape(-1) == 1) & (error.reshape(-1) < self.max_flow_error)
+
+        # Kepercayaan turun (bahu hilang atau sebagian besar titik gagal): minta keyframe
+        if not tracked[SHOULDER_SLOTS].all() or tracked.sum() < len(TRACKED_LANDMARKS) // 2:
+            return None
+
+        # Titik yang gagal dilacak memakai prediktor kecepatan konstan
+        predicted = self._points + self._velocity
+        new_points = np.where(tracked[:, None, None], new_points, predicted).astype(np.float32)
+
+        # Perbarui kecepatan (rata-rata bergerak) dan sesuaikan K dengan besar gerakan
+        self._velocity = 0.5 * self._velocity + 0.5 * (new_points - self._points)
+        self._adapt_interval(float(np.linalg.norm(self._velocity, axis=2).mean()))
+
+        # Semua landmark digeser: titik terlacak ke posisi barunya, sisanya mengikuti sendi jangkarnya
+        height, width = gray.shape
+        displacement = self._anchor_weights @ (new_points - self._keyframe_points)[:, 0, :]
+        positions = (self._keyframe_all + displacement) / np.array([width, height], dtype=np.float32)
+        for landmark, (x, y) in zip(self._landmarks.landmark, positions.tolist()):
+            landmark.x = x
+            landmark.y = y
+
+        self._points = new_points
+        self._prev_gray = gray
+        self.frames_since_keyframe += 1
+        return TrackedPoseResults(self._landmarks)
+
+    def _adapt_interval(self, motion):
+        # Gerakan besar -> K kecil (sering inferensi), gerakan kecil -> K besar
+        if motion >= self.motion_high:
+            self.interval = self.min_interval
+        elif motion <= self.motion_low:
+            self.interval = self.max_interval
+        else:
+            ratio = (motion - self.motion_low) / (self.motion_high - self.motion_low)
+            self.interval = int(round(self.max_interval - ratio * (self.max_interval - self.min_interval)))
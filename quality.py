@@ -0,0 +1,106 @@
+import time
+from collections import deque
+
+
+class QualityTier:
+    """
+    Satu tingkat kualitas tampilan dan pemrosesan.
+    """
+    def __init__(self, name, render_scale, webcam_scale, pose_input_width, model_complexity, blur, draw_landmarks):
+        """
+        Parameters:
+            name (str): Nama tingkat kualitas.
+            render_scale (float): Skala resolusi render internal (di bawah 1.0 diperbesar oleh pygame.SCALED).
+            webcam_scale (float): Skala ukuran tampilan webcam relatif terhadap area webcam.
+            pose_input_width (int | None): Lebar frame untuk inferensi pose (None = resolusi kamera penuh).
+            model_complexity (int): Kompleksitas model MediaPipe Pose (0, 1, atau 2).
+            blur (bool): Apakah frame kamera di-blur sebelum diproses.
+            draw_landmarks (bool): Apakah landmark pose digambar di tampilan webcam.
+        """
+        self.name = name
+        self.render_scale = render_scale
+        self.webcam_scale = webcam_scale
+        self.pose_input_width = pose_input_width
+        self.model_complexity = model_complexity
+        self.blur = blur
+        self.draw_landmarks = draw_landmarks
+
+
+# Urutan dari kualitas tertinggi ke terendah
+QUALITY_TIERS = [
+    QualityTier("high", render_scale=1.0, webcam_scale=1.0, pose_input_width=None, model_complexity=1, blur=True, draw_landmarks=True),
+    QualityTier("medium", render_scale=1.0, webcam_scale=0.75, pose_input_width=480, model_complexity=1, blur=True, draw_landmarks=True),
+    QualityTier("low", render_scale=1.0, webcam_scale=0.5, pose_input_width=320, model_complexity=0, blur=False, draw_landmarks=True),
+    QualityTier("minimum", render_scale=0.5, webcam_scale=0.5, pose_input_width=256, model_complexity=0, blur=False, draw_landmarks=False),
+]
+
+
+class QualityController:
+    """
+    Mengamati waktu frame bergulir dan berpindah antar tingkat kualitas agar FPS target
+    tetap tercapai. Menggunakan histeresis (margin turun/naik) dan jeda antar perubahan
+    supaya kualitas tidak bolak-balik.
+    """
+    def __init__(self, target_fps=24, tiers=None, window_size=30, downgrade_margin=0.9, upgrade_margin=1.3,
+                 cooldown=2.0, start_tier=0):
+        """
+        Parameters:
+            target_fps (float): FPS yang ingin dipertahankan.
+            tiers (list): Daftar QualityTier dari kualitas tertinggi ke terendah.
+            window_size (int): Jumlah waktu frame terakhir yang diamati.
+            downgrade_margin (float): Turunkan kualitas jika FPS < target * margin ini.
+            upgrade_margin (float): Naikkan kualitas jika FPS > target * margin ini.
+            cooldown (float): Jeda minimum (detik) antar perubahan tingkat kualitas.
+            start_tier (int): Indeks tingkat kualitas awal.
+        """
+        self.target_fps = target_fps
+        self.tiers = tiers if tiers else QUALITY_TIERS
+        self.frame_times = deque(maxlen=window_size)
+        self.downgrade_margin = downgrade_margin
+        self.upgrade_margin = upgrade_margin
+        self.cooldown = cooldown
+        self.tier_index = start_tier
+        self.last_change_time = time.time()
+
+    @property
+    def tier(self):
+        # Tingkat kualitas yang sedang aktif
+        return self.tiers[self.tier_index]
+
+    def get_average_fps(self):
+        # FPS dari median waktu frame yang tersimpan; median tidak terseret oleh satu-dua frame
+        # yang sangat lama (mis. memuat ulang model pose) seperti rata-rata biasa
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        middle = len(ordered) // 2
+        median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+        return 1.0 / median if median > 0 else 0.0
+
+    def record_frame(self, frame_time):
+        """
+        Mencatat waktu kerja satu frame (detik) dan memperbarui tingkat kualitas bila perlu.
+        Waktu menunggu kamera dan audio sebaiknya sudah dikurangkan oleh pemanggil, karena
+        FPS yang diukur dibandingkan dengan target * upgrade_margin.
+
+        Returns:
+            bool: True jika tingkat kualitas berubah.
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+        if time.time() - self.last_change_time < self.cooldown:
+            return False
+
+        fps = self.get_average_fps()
+        if fps < self.target_fps * self.downgrade_margin and self.tier_index < len(self.tiers) - 1:
+            self.tier_index += 1
+        elif fps > self.target_fps * self.upgrade_margin and self.tier_index > 0:
+            self.tier_index -= 1
+        else:
+            return False
+
+        print(f"Kualitas diubah ke '{self.tier.name}' (FPS rata-rata: {fps:.1f})")
+        self.frame_times.clear()
+        self.last_change_time = time.time()
+        return True
@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+import pygame
+
+
+class ReplayBuffer:
+    """
+    Buffer instant replay berukuran tetap: N detik terakhir dari frame layar yang sudah
+    dikomposisi, disimpan sebagai JPEG di dalam slab byte yang dialokasikan di awal.
+    Game loop hanya memperkecil layar ke buffer staging; kompresi JPEG dilakukan di
+    thread worker. Jika worker masih sibuk, frame dilewati agar FPS permainan tidak turun.
+    Waktu perekaman setiap frame disimpan, sehingga pemutaran dan ekspor mengikuti laju
+    yang benar-benar terekam, bukan laju yang diminta.
+    """
+    def __init__(self, screen_size, seconds=5.0, fps=15, width=320, jpeg_quality=70, expected_fps=10):
+        """
+        Parameters:
+            screen_size (tuple): Ukuran layar yang direkam (lebar, tinggi).
+            seconds (float): Panjang replay dalam detik.
+            fps (float): Laju perekaman frame replay maksimum.
+            width (int): Lebar frame replay; tinggi mengikuti rasio layar.
+            jpeg_quality (int): Kualitas JPEG (0-100).
+            expected_fps (float): Perkiraan laju tick game loop (rekaman suara memblok 100 ms per tick,
+                jadi sekitar 10). Kapasitas dihitung dari laju yang lebih kecil agar replay tetap sepanjang `seconds`.
+        """
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+        self.frame_size = (width, max(1, int(width * screen_size[1] / screen_size[0])))
+        self.capacity = max(1, int(seconds * min(fps, expected_fps)))
+
+        # Slab JPEG tetap: satu slot per frame, seperempat ukuran frame mentah sudah cukup lega untuk JPEG
+        self.slot_bytes = self.frame_size[0] * self.frame_size[1] * 3 // 4
+        self._slab = np.zeros((self.capacity, self.slot_bytes), dtype=np.uint8)
+        self._lengths = np.zeros(self.capacity, dtype=np.int32)
+        self._timestamps = np.zeros(self.capacity, dtype=np.float64)  # Waktu perekaman per slot
+        self._frames_written = 0
+        self._lock = threading.Lock()
+
+        # Dua buffer staging: satu bisa diisi game loop selagi satu lagi dikompresi worker
+        self._staging_surface = pygame.Surface(self.frame_size)
+        self._free_staging = queue.Queue()
+        for _ in range(2):
+            self._free_staging.put(np.zeros((self.frame_size[0], self.frame_size[1], 3), dtype=np.uint8))
+        self._encode_queue = queue.Queue()
+
+        self.dropped_frames = 0
+        self._last_capture_time = 0.0
+        self.recording = True
+        self._worker = threading.Thread(target=self._encode_loop, name="ReplayEncoder", daemon=True)
+        self._worker.start()
+
+    def capture(self, screen):
+        """
+        Menyalin layar saat ini ke buffer staging untuk dikompresi (dipanggil setelah layar digambar).
+        """
+        if not self.recording:
+            return
+        now = time.time()
+        if now - self._last_capture_time < 1.0 / self.fps:
+            return
+        try:
+            staging = self._free_staging.get_nowait()
+        except queue.Empty:
+            self.dropped_frames += 1  # Worker masih sibuk, lewati frame ini
+            return
+        self._last_capture_time = now
+
+        pygame.transform.scale(screen, self.frame_size, self._staging_surface)
+        pixels = pygame.surfarray.pixels3d(self._staging_surface)
+        np.copyto(staging, pixels)
+        del pixels  # Lepas kunci surface
+        self._encode_queue.put((staging, now))
+
+    def _encode_loop(self):
+        # Thread worker: kompres frame staging ke JPEG dan tulis ke slot berikutnya di slab
+        while True:
+            item = self._encode_queue.get()
+            if item is None:
+                break
+            staging, timestamp = item
+            bgr = cv2.cvtColor(staging.swapaxes(0, 1), cv2.COLOR_RGB2BGR)
+            self._free_staging.put(staging)
+
+            quality = self.jpeg_quality
+            ok, encoded = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            while ok and len(encoded) > self.slot_bytes and quality > 20:
+                quality -= 20
+                ok, encoded = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok or len(encoded) > self.slot_bytes:
+                self.dropped_frames += 1
+                continue
+
+            with self._lock:
+                slot = self._frames_written % self.capacity
+                self._slab[slot, :len(encoded)] = encoded.reshape(-1)
+                self._lengths[slot] = len(encoded)
+                self._timestamps[slot] = timestamp
+                self._frames_written += 1
+
+    def stop(self):
+        """
+        Menghentikan perekaman dan menunggu worker menyelesaikan frame yang tersisa.
+        """
+        if not self.recording:
+            return
+        self.recording = False
+        self._encode_queue.put(None)
+        self._worker.join()
+
+    def __len__(self):
+        return min(self._frames_written, self.capacity)
+
+    def get_jpeg(self, index):
+        # Mengembalikan bytes JPEG frame ke-index (0 = frame tertua yang masih tersimpan)
+        with self._lock:
+            count = min(self._frames_written, self.capacity)
+            slot = (self._frames_written - count + index) % self.capacity
+            return self._slab[slot, :self._lengths[slot]].tobytes()
+
+    def get_timestamps(self):
+        # Waktu perekaman frame yang masih tersimpan, urut dari yang tertua
+        with self._lock:
+            count = min(self._frames_written, self.capacity)
+            slots = (self._frames_written - count + np.arange(count)) % self.capacity
+            return self._timestamps[slots]
+
+    def get_frame_durations(self):
+        """
+        Lama tampil setiap frame saat diputar ulang: selisih waktu perekaman dengan frame berikutnya.
+        Frame terakhir memakai median selisih tersebut.
+
+        Returns:
+            numpy.ndarray: Durasi per frame (detik).
+        """
+        timestamps = self.get_timestamps()
+        if len(timestamps) < 2:
+            return np.full(len(timestamps), 1.0 / self.fps)
+        intervals = np.diff(timestamps)
+        return np.append(intervals, np.median(intervals))
+
+    def get_measured_fps(self):
+        # Laju rata-rata frame yang benar-benar terekam (fps yang diminta jika belum cukup frame)
+        timestamps = self.get_timestamps()
+        if len(timestamps) < 2 or timestamps[-1] <= timestamps[0]:
+            return float(self.fps)
+        return (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+
+    def decode_frame(self, index):
+        """
+        Mendekode frame ke-index menjadi pygame Surface untuk diputar di layar hasil.
+        """
+        bgr = cv2.imdecode(np.frombuffer(self.get_jpeg(index), dtype=np.uint8), cv2.IMREAD_COLOR)
+        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        return pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+
+    def export_mp4(self, path):
+        """
+        Mengekspor replay ke file MP4 di thread latar belakang.
+
+        Returns:
+            threading.Thread: Thread ekspor yang sedang berjalan.
+        """
+        jpegs = [self.get_jpeg(i) for i in range(len(self))]
+        fps = self.get_measured_fps()
+
+        def write():
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, self.frame_size)
+            for data in jpegs:
+                writer.write(cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR))
+            writer.release()
+            print(f"Replay disimpan ke '{path}'.")
+
+        # Bukan daemon agar ekspor tetap selesai walaupun permainan sudah ditutup
+        thread = threading.Thread(target=write, name="ReplayExport")
+        thread.start()
+        return thread
@@ -0,0 +1,144 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Jalankan pygame tanpa jendela dan tanpa perangkat audio (headless)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from game import Game
+from capture import CameraCapture, SyntheticFrameSource
+
+
+class SyntheticVoice:
+    """
+    Sumber audio sintetis untuk InputHandler: nada harmonis dengan volume acak,
+    kadang diam, sehingga game loop melewati cabang bergerak dan kalah.
+    """
+    def __init__(self, voice_probability=0.6, seed=0, realtime=False):
+        self.voice_probability = voice_probability
+        self.rng = np.random.default_rng(seed)
+        self.realtime = realtime
+
+    def __call__(self, num_samples, fs):
+        if self.realtime:
+            time.sleep(num_samples / fs)  # Meniru lamanya sd.rec + sd.wait
+        t = np.arange(num_samples, dtype=np.float32) / fs
+        noise = self.rng.normal(0, 0.002, num_samples).astype(np.float32)
+        if self.rng.random() > self.voice_probability:
+            return noise
+        pitch = self.rng.uniform(150, 600)
+        amplitude = self.rng.uniform(0.05, 0.3)
+        voice = amplitude * (np.sin(2 * np.pi * pitch * t) + 0.5 * np.sin(4 * np.pi * pitch * t))
+        return (voice + noise).astype(np.float32)
+
+
+def get_rss_mb():
+    # Mengambil resident set size proses saat ini dalam MB
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Puncak, bukan nilai saat ini
+
+
+def run_round(max_ticks, voice, camera_fps):
+    # Memainkan satu ronde seperti main.py: buat Game baru, mulai, jalankan tick hingga selesai
+    game = Game(capture=CameraCapture(SyntheticFrameSource(), fps=camera_fps), audio_source=voice)
+    ticks = 0
+    if game.is_running:
+        game.start_game()
+        while game.is_running and ticks < max_ticks:
+            game.tick()
+            ticks += 1
+        game._end_tick()
+        game.cap.release()
+        if game.replay is not None:
+            game.replay.stop()
+    game.input_handler.close()
+    pygame.quit()
+    return ticks
+
+
+def fit_slope(xs, ys):
+    # Kemiringan regresi linear (perubahan y per satuan x)
+    if len(xs) < 2:
+        return 0.0
+    return float(np.polyfit(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), 1)[0])
+
+
+def soak(rounds, max_ticks, warmup_rounds, slope_threshold_mb, top_n, voice, camera_fps=30):
+    """
+    Menjalankan banyak ronde dan mengukur pertumbuhan memori.
+
+    Returns:
+        bool: True jika kemiringan memori di bawah ambang batas.
+    """
+    tracemalloc.start(10)
+    baseline = None
+    total_ticks = 0
+    samples = []  # (total_ticks, rss_mb, traced_mb)
+    start_time = time.time()
+
+    for round_index in range(rounds):
+        total_ticks += run_round(max_ticks, voice, camera_fps)
+        # Kumpulkan siklus referensi dulu agar yang terukur hanya objek yang benar-benar masih hidup
+        gc.collect()
+        traced_mb = tracemalloc.get_traced_memory()[0] / 2**20
+        rss_mb = get_rss_mb()
+        print(f"Ronde {round_index + 1}/{rounds}: tick={total_ticks}, RSS={rss_mb:.1f} MB, tracemalloc={traced_mb:.1f} MB")
+
+        if round_index + 1 == warmup_rounds:
+            baseline = tracemalloc.take_snapshot()
+        if round_index + 1 >= warmup_rounds:
+            samples.append((total_ticks, rss_mb, traced_mb))
+
+    final_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    ticks, rss, traced = zip(*samples) if samples else ((), (), ())
+    rss_slope = fit_slope(ticks, rss) * 1000
+    traced_slope = fit_slope(ticks, traced) * 1000
+
+    print(f"\nDurasi: {time.time() - start_time:.1f} detik, total tick: {total_ticks}")
+    print(f"Kemiringan RSS: {rss_slope:.3f} MB / 1000 tick")
+    print(f"Kemiringan tracemalloc: {traced_slope:.3f} MB / 1000 tick")
+
+    # Lokasi alokasi dengan pertumbuhan terbesar sejak akhir pemanasan
+    print(f"\nTop {top_n} lokasi alokasi (pertumbuhan sejak pemanasan):")
+    stats = final_snapshot.compare_to(baseline, "lineno") if baseline else final_snapshot.statistics("lineno")
+    for stat in stats[:top_n]:
+        print(f"  {stat}")
+
+    passed = max(rss_slope, traced_slope) <= slope_threshold_mb
+    print("\nHASIL: " + ("LULUS" if passed else f"GAGAL (kemiringan melebihi {slope_threshold_mb} MB / 1000 tick)"))
+    return passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Soak test headless untuk mendeteksi kebocoran memori pada game loop.")
+    parser.add_argument("--rounds", type=int, default=50, help="Jumlah ronde yang dimainkan")
+    parser.add_argument("--max-ticks", type=int, default=300, help="Jumlah tick maksimum per ronde")
+    parser.add_argument("--warmup-rounds", type=int, default=3, help="Ronde awal yang diabaikan dalam perhitungan kemiringan")
+    parser.add_argument("--slope-threshold", type=float, default=1.0, help="Ambang kemiringan memori (MB per 1000 tick)")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah lokasi alokasi teratas yang ditampilkan")
+    parser.add_argument("--realtime-audio", action="store_true", help="Tunggu 100 ms per blok audio seperti mikrofon asli")
+    parser.add_argument("--camera-fps", type=float, default=30, help="FPS kamera sintetis")
+    parser.add_argument("--seed", type=int, default=0, help="Seed untuk suara sintetis")
+    args = parser.parse_args()
+
+    voice = SyntheticVoice(seed=args.seed, realtime=args.realtime_audio)
+    ok = soak(args.rounds, args.max_ticks, args.warmup_rounds, args.slope_threshold, args.top, voice, args.camera_fps)
+    sys.exit(0 if ok else 1)
@@ -2,6 +2,8 @@ import pygame
 import time
 import os
 
+from tracing import traced
+
 class SoundManager:
     """
     Mengelola pemutaran suara menggunakan Pygame mixer.
@@ -18,6 +20,7 @@ class SoundManager:
             'lose': os.path.join(assets_dir, 'lose.mp3')                # Suara saat kalah
         }
 
+    @traced("SoundManager.play_sound")
     def play_sound(self, sound_name):
         """
         Memutar suara tertentu berdasarkan nama yang diberikan.
@@ -0,0 +1,128 @@
+import numpy as np
+from scipy.signal import butter, freqz
+
+# Pita energi default (Hz) di dalam rentang band-pass suara
+DEFAULT_BANDS = ((128.0, 256.0), (256.0, 512.0), (512.0, 1024.0))
+
+# Jumlah harmonik yang dihitung untuk harmonicity
+NUM_HARMONICS = 5
+
+
+def feature_dtype(num_bands=len(DEFAULT_BANDS)):
+    # Struktur hasil analisis per blok: satu record NumPy berukuran tetap
+    return np.dtype([
+        ("rms", np.float32),
+        ("pitch", np.float32),
+        ("centroid", np.float32),
+        ("band_energy", np.float32, (num_bands,)),
+        ("harmonicity", np.float32),
+        ("flux", np.float32),
+    ])
+
+
+FEATURE_DTYPE = feature_dtype()
+
+
+class SpectralAnalyzer:
+    """
+    Menghitung beberapa fitur suara dari satu rFFT berjendela per blok audio:
+    RMS, pitch, spectral centroid, energi per pita, harmonicity, dan onset flux.
+    Filter band-pass Butterworth diterapkan di domain frekuensi (dikalikan dengan
+    respons magnitudonya), sehingga tidak ada lagi pass filter terpisah di domain waktu.
+    Menerima satu blok (1D) atau banyak blok sekaligus (2D, satu blok per baris).
+    """
+    def __init__(self, block_size, fs=44100, lowcut=128.0, highcut=1024.0, order=5, bands=DEFAULT_BANDS):
+        """
+        Parameters:
+            block_size (int): Jumlah sampel per blok.
+            fs (int): Sample rate audio.
+            lowcut (float): Frekuensi bawah band-pass (Hz).
+            highcut (float): Frekuensi atas band-pass (Hz).
+            order (int): Orde filter Butterworth.
+            bands (tuple): Daftar pita (frekuensi bawah, frekuensi atas) untuk energi per pita.
+        """
+        self.block_size = block_size
+        self.fs = fs
+        self.config = (block_size, fs, lowcut, highcut, order)
+        self.dtype = feature_dtype(len(bands))
+
+        # Semua yang bergantung pada ukuran blok dihitung sekali di sini
+        self.window = np.hamming(block_size).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(block_size, d=1.0 / fs)
+        self.bin_width = fs / block_size
+        b, a = butter(order, [lowcut / (0.5 * fs), highcut / (0.5 * fs)], btype='band')
+        _, response = freqz(b, a, worN=self.freqs, fs=fs)
+        self.filter_gain = np.abs(response).astype(np.float32)
+
+        # Bobot Parseval untuk spektrum satu sisi: bin DC (dan Nyquist untuk N genap) tidak digandakan
+        weights = np.full(len(self.freqs), 2.0)
+        weights[0] = 1.0
+        if block_size % 2 == 0:
+            weights[-1] = 1.0
+        self.power_weights = (weights / (block_size * np.sum(self.window.astype(np.float64) ** 2))).astype(np.float32)
+
+        # Matriks keanggotaan pita (B, F) agar energi semua pita dihitung dengan satu perkalian matriks
+        self.band_matrix = np.array([(self.freqs >= low) & (self.freqs < high) for low, high in bands],
+                                    dtype=np.float32)
+
+        # Magnitudo blok sebelumnya untuk onset flux pada aliran blok berurutan
+        self.previous_magnitudes = None
+
+    def reset(self):
+        # Melupakan blok sebelumnya (mis. saat sumber audio berganti)
+        self.previous_magnitudes = None
+
+    def analyze(self, audio_data, return_spectrum=False):
+        """
+        Menganalisis satu blok atau banyak blok berurutan.
+
+        Parameters:
+            audio_data (numpy.ndarray): Blok audio (block_size,) atau (N, block_size).
+            return_spectrum (bool): Jika True, juga mengembalikan frekuensi dan magnitudo spektrum terfilter.
+
+        Returns:
+            numpy.ndarray: Record FEATURE_DTYPE (satu record untuk satu blok, array (N,) untuk banyak blok),
+            atau tuple (features, freqs, magnitudes) jika return_spectrum=True.
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        single = audio_data.ndim == 1
+        blocks = audio_data[None, :] if single else audio_data
+
+        # Satu rFFT berjendela per blok, lalu band-pass di domain frekuensi
+        centered = blocks - blocks.mean(axis=1, keepdims=True)
+        magnitudes = np.abs(np.fft.rfft(centered * self.window, axis=1)) * self.filter_gain
+        power = magnitudes ** 2 * self.power_weights
+        total_power = power.sum(axis=1)
+        safe_total = np.maximum(total_power, 1e-20)
+
+        features = np.zeros(len(blocks), dtype=self.dtype)
+        features["rms"] = np.sqrt(total_power)
+        peak_index = np.argmax(magnitudes, axis=1)
+        pitch = self.freqs[peak_index]
+        features["pitch"] = pitch
+        features["centroid"] = power @ self.freqs / safe_total
+        features["band_energy"] = power @ self.band_matrix.T
+
+        # Harmonicity: porsi energi yang berada di sekitar (+-1 bin) kelipatan pitch
+        harmonic_bins = np.rint(np.arange(1, NUM_HARMONICS + 1) * pitch[:, None] / self.bin_width).astype(np.intp)
+        neighbourhood = (harmonic_bins[:, :, None] + np.array([-1, 0, 1])).reshape(len(blocks), -1)
+        neighbourhood = np.clip(neighbourhood, 0, len(self.freqs) - 1)
+        # Bin yang sama (mis. pitch sangat rendah) hanya dihitung sekali
+        harmonic_mask = np.zeros(power.shape, dtype=bool)
+        np.put_along_axis(harmonic_mask, neighbourhood, True, axis=1)
+        features["harmonicity"] = np.where(total_power > 0, (power * harmonic_mask).sum(axis=1) / safe_total, 0.0)
+
+        # Onset flux: kenaikan magnitudo positif terhadap blok sebelumnya, dinormalisasi ke [0, 1]
+        previous = np.empty_like(magnitudes)
+        previous[1:] = magnitudes[:-1]
+        previous[0] = self.previous_magnitudes if self.previous_magnitudes is not None else magnitudes[0]
+        rise = np.maximum(magnitudes - previous, 0.0).sum(axis=1)
+        features["flux"] = rise / np.maximum(magnitudes.sum(axis=1), 1e-12)
+        self.previous_magnitudes = magnitudes[-1].copy()
+
+        if single:
+            features = features[0]
+            magnitudes = magnitudes[0]
+        if return_spectrum:
+            return features, self.freqs, magnitudes
+        return features
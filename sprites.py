@@ -0,0 +1,120 @@
+import os
+from collections import OrderedDict
+import pygame
+from PIL import Image, ImageSequence
+
+# Ukuran satu frame karakter di layar (piksel)
+FRAME_SIZE = (60, 60)
+
+# Daftar skin karakter yang bisa dipilih: nama -> file GIF di direktori aset
+DEFAULT_SKINS = {
+    "mario": "mario.gif",
+}
+
+
+class SpriteAtlas:
+    """
+    Semua frame animasi satu karakter yang dikemas berjajar dalam satu surface (texture atlas).
+    Frame digambar dengan area blit: screen.blit(atlas.surface, pos, atlas.frame_rects[i]).
+    """
+    def __init__(self, surface, frame_rects):
+        self.surface = surface
+        self.frame_rects = frame_rects
+
+    def __len__(self):
+        return len(self.frame_rects)
+
+    @classmethod
+    def from_gif(cls, path, frame_size=FRAME_SIZE):
+        """
+        Memuat GIF dan mengemas setiap frame (RGBA, diubah ke frame_size) secara horizontal ke satu atlas.
+
+        Returns:
+            SpriteAtlas: Atlas berisi semua frame, atau None jika GIF gagal dimuat.
+        """
+        try:
+            gif = Image.open(path)
+            frames = [frame.convert("RGBA").resize(frame_size) for frame in ImageSequence.Iterator(gif)]
+        except FileNotFoundError:
+            print(f"Error: GIF file tidak ditemukan di path '{path}'")
+            return None
+        except Exception as e:
+            print(f"Error saat memuat frame dari GIF '{path}': {e}")
+            return None
+        if not frames:
+            return None
+
+        width, height = frame_size
+        sheet = Image.new("RGBA", (width * len(frames), height))
+        for i, frame in enumerate(frames):
+            sheet.paste(frame, (i * width, 0))
+        surface = pygame.image.frombuffer(sheet.tobytes(), sheet.size, "RGBA")
+        # Konversi ke format piksel layar agar blit cepat (butuh mode tampilan yang sudah diset)
+        surface = surface.convert_alpha() if pygame.display.get_surface() else surface.copy()
+
+        frame_rects = [pygame.Rect(i * width, 0, width, height) for i in range(len(frames))]
+        return cls(surface, frame_rects)
+
+
+class SkinLibrary:
+    """
+    Koleksi skin karakter yang dimuat secara lazy: atlas baru dibuat saat skin pertama kali
+    dipilih (Player.set_skin), dan skin yang paling lama tidak dipakai dilepas jika melebihi max_loaded.
+    Surface terikat pada sesi pygame, jadi satu library dibuat per Game.
+    """
+    def __init__(self, assets_dir, skins=None, frame_size=FRAME_SIZE, max_loaded=2):
+        """
+        Parameters:
+            assets_dir (str): Direktori tempat file GIF skin berada.
+            skins (dict): Pemetaan nama skin -> nama file GIF (default DEFAULT_SKINS).
+            frame_size (tuple): Ukuran setiap frame (lebar, tinggi).
+            max_loaded (int): Jumlah atlas maksimum yang disimpan di memori.
+        """
+        self.assets_dir = assets_dir
+        self.skins = dict(skins if skins else DEFAULT_SKINS)
+        self.frame_size = frame_size
+        self.max_loaded = max(1, max_loaded)
+        self._atlases = OrderedDict()  # nama -> SpriteAtlas, urut dari yang paling lama tidak dipakai
+        self._failed = set()
+
+    @property
+    def names(self):
+        return list(self.skins)
+
+    def register(self, name, filename):
+        # Menambahkan skin baru ke daftar pilihan
+        self.skins[name] = filename
+        self._failed.discard(name)
+
+    def next_name(self, name):
+        # Nama skin berikutnya dalam daftar (berputar kembali ke awal)
+        names = self.names
+        index = names.index(name) if name in names else -1
+        return names[(index + 1) % len(names)]
+
+    def get(self, name):
+        """
+        Mengembalikan atlas untuk skin `name`, memuatnya jika belum ada di memori.
+
+        Returns:
+            SpriteAtlas: Atlas skin, atau None jika skin tidak dikenal atau gagal dimuat.
+        """
+        atlas = self._atlases.get(name)
+        if atlas is not None:
+            self._atlases.move_to_end(name)
+            return atlas
+        if name not in self.skins or name in self._failed:
+            return None
+
+        atlas = SpriteAtlas.from_gif(os.path.join(self.assets_dir, self.skins[name]), self.frame_size)
+        if atlas is None:
+            self._failed.add(name)  # Jangan coba memuat ulang file yang rusak setiap frame
+            return None
+        self._atlases[name] = atlas
+        while len(self._atlases) > self.max_loaded:
+            self._atlases.popitem(last=False)
+        return atlas
+
+    def loaded_names(self):
+        # Nama skin yang atlasnya sedang ada di memori
+        return list(self._atlases)
@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Kode numerik untuk status lampu agar bisa disimpan dalam kolom integer
+LIGHT_STATE_CODES = {"initial": 0, "green": 1, "transition_to_red": 2, "red": 3}
+
+# Nama dan tipe data setiap kolom telemetri
+TELEMETRY_COLUMNS = [
+    ("timestamp", np.float64),      # Waktu (detik sejak epoch) saat tick dimulai
+    ("audio_rms", np.float32),      # Volume suara (RMS), NaN jika tidak direkam pada tick ini
+    ("pitch", np.float32),          # Pitch suara (Hz), NaN jika tidak direkam pada tick ini
+    ("light_state", np.int8),       # Kode status lampu (lihat LIGHT_STATE_CODES)
+    ("player_x", np.float32),       # Posisi horizontal pemain
+    ("frame_time", np.float32),     # Durasi tick dalam detik
+    ("pose_visibility", np.float32) # Visibilitas minimum kedua bahu, NaN jika pose tidak terdeteksi
+]
+
+
+class _ColumnBuffer:
+    """
+    Satu blok kolom NumPy yang dialokasikan di awal dengan kapasitas tetap.
+    """
+    def __init__(self, capacity):
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in TELEMETRY_COLUMNS}
+        self.size = 0
+
+
+class TelemetryRecorder:
+    """
+    Merekam telemetri per tick permainan ke kolom yang sudah dialokasikan,
+    lalu menulisnya per batch ke file CSV atau Parquet di thread latar belakang.
+    Pemanggil (game loop) tidak pernah menunggu penulisan file; jika semua buffer
+    sedang menunggu ditulis, baris baru dibuang dan dihitung di `dropped_rows`.
+    """
+    def __init__(self, output_dir="telemetry", batch_size=1024, max_pending_batches=4, file_format="csv"):
+        """
+        Parameters:
+            output_dir (str): Direktori tujuan file telemetri.
+            batch_size (int): Jumlah baris per batch (kapasitas satu buffer kolom).
+            max_pending_batches (int): Jumlah batch maksimum yang boleh antre ditulis (membatasi memori).
+            file_format (str): "csv" (satu file yang terus ditambah) atau "parquet" (satu file per batch).
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Format telemetri tidak dikenal: '{file_format}'")
+
+        self.file_format = file_format
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        session_name = time.strftime("session_%Y%m%d_%H%M%S")
+        self.session_path = os.path.join(output_dir, session_name)
+
+        # Kumpulan buffer tetap: satu aktif, sisanya bisa antre ke writer
+        self._free_buffers = queue.Queue()
+        for _ in range(max_pending_batches + 1):
+            self._free_buffers.put(_ColumnBuffer(batch_size))
+        self._pending = queue.Queue()
+        self._active = self._free_buffers.get()
+
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self._batch_index = 0
+        self._closed = False
+
+        self._writer = threading.Thread(target=self._writer_loop, name="TelemetryWriter", daemon=True)
+        self._writer.start()
+
+    def record(self, audio_rms, pitch, light_state, player_x, frame_time, pose_visibility, timestamp=None):
+        """
+        Menyimpan satu baris telemetri. Tidak pernah memblokir game loop.
+        """
+        if self._closed:
+            return
+
+        buffer = self._active
+        if buffer is None:
+            # Semua buffer penuh dan menunggu ditulis; coba ambil buffer yang sudah kembali
+            try:
+                buffer = self._active = self._free_buffers.get_nowait()
+            except queue.Empty:
+                self.dropped_rows += 1
+                return
+
+        row = buffer.size
+        columns = buffer.columns
+        columns["timestamp"][row] = time.time() if timestamp is None else timestamp
+        columns["audio_rms"][row] = audio_rms
+        columns["pitch"][row] = pitch
+        columns["light_state"][row] = LIGHT_STATE_CODES.get(light_state, -1)
+        columns["player_x"][row] = player_x
+        columns["frame_time"][row] = frame_time
+        columns["pose_visibility"][row] = pose_visibility
+        buffer.size += 1
+
+        if buffer.size == len(columns["timestamp"]):
+            self._submit_active()
+
+    def _submit_active(self):
+        # Serahkan buffer aktif ke writer dan ambil buffer kosong jika tersedia
+        self._pending.put(self._active)
+        try:
+            self._active = self._free_buffers.get_nowait()
+        except queue.Empty:
+            self._active = None
+
+    def close(self):
+        """
+        Menulis sisa baris yang belum tersimpan dan menghentikan thread writer.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._active is not None and self._active.size > 0:
+            self._submit_active()
+        self._pending.put(None)  # Sinyal berhenti untuk writer
+        self._writer.join()
+
+    def _writer_loop(self):
+        # Thread latar belakang: tulis setiap batch lalu kembalikan buffer ke pool
+        while True:
+            buffer = self._pending.get()
+            if buffer is None:
+                break
+            try:
+                self._write_batch(buffer)
+            except Exception as e:
+                print(f"Error saat menulis telemetri: {e}")
+            buffer.size = 0
+            self._free_buffers.put(buffer)
+
+    def _write_batch(self, buffer):
+        # Mengubah isi buffer menjadi DataFrame dan menulis ke file
+        frame = pd.DataFrame({name: column[:buffer.size] for name, column in buffer.columns.items()})
+        if self.file_format == "csv":
+            path = self.session_path + ".csv"
+            frame.to_csv(path, mode="a", header=self._batch_index == 0, index=False)
+        else:
+            path = f"{self.session_path}_part{self._batch_index:05d}.parquet"
+            frame.to_parquet(path, index=False)
+        self._batch_index += 1
+        self.written_rows += buffer.size
@@ -0,0 +1,169 @@
+import functools
+import itertools
+import json
+import threading
+import time
+import numpy as np
+
+# Fase event dalam format Chrome Trace Event
+PHASE_BEGIN = 0
+PHASE_END = 1
+PHASE_SKIP = -1  # Slot yang dipakai oleh dump() untuk membaca counter, bukan event
+_PHASE_CODES = ("B", "E")
+
+
+class _NullSpan:
+    """
+    Span kosong yang dipakai saat tracing mati, sehingga `with tracer.span(...)` hampir tanpa biaya.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """
+    Span bernama yang mencatat event begin/end ke ring buffer tracer.
+    Objek ini tidak menyimpan status per pemanggilan, jadi satu objek dipakai ulang untuk setiap nama.
+    """
+    __slots__ = ("tracer", "name_id")
+
+    def __init__(self, tracer, name_id):
+        self.tracer = tracer
+        self.name_id = name_id
+
+    def __enter__(self):
+        self.tracer._record(self.name_id, PHASE_BEGIN)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer._record(self.name_id, PHASE_END)
+        return False
+
+
+class Tracer:
+    """
+    Perekam span opsional untuk game loop. Event disimpan ke ring buffer berukuran tetap
+    (array NumPy yang dialokasikan di awal) lalu diekspor sebagai JSON Chrome Trace Event
+    yang bisa dibuka di chrome://tracing atau Perfetto UI.
+    """
+    def __init__(self, capacity=65536):
+        """
+        Parameters:
+            capacity (int): Jumlah event maksimum yang disimpan; event tertua ditimpa.
+        """
+        self.enabled = False
+        self.capacity = capacity
+        self._name_index = np.zeros(capacity, dtype=np.int32)
+        self._phase = np.zeros(capacity, dtype=np.int8)
+        self._timestamp_ns = np.zeros(capacity, dtype=np.int64)
+        self._thread_id = np.zeros(capacity, dtype=np.uint64)
+        self._counter = itertools.count()
+
+        self._names = []
+        self._spans = {}
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        # Mengaktifkan tracing dan mengosongkan ring buffer
+        self._counter = itertools.count()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name):
+        """
+        Mengembalikan context manager yang mencatat begin/end untuk `name`.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self._spans.get(name)
+        if span is None:
+            with self._lock:
+                span = self._spans.get(name)
+                if span is None:
+                    self._names.append(name)
+                    span = self._spans[name] = _Span(self, len(self._names) - 1)
+        return span
+
+    def _record(self, name_id, phase):
+        # Menulis satu event ke slot berikutnya (itertools.count aman dipakai antar thread di CPython)
+        slot = next(self._counter)
+        index = slot % self.capacity
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        self._name_index[index] = name_id
+        self._phase[index] = phase
+        self._timestamp_ns[index] = time.perf_counter_ns()
+        self._thread_id[index] = thread_id
+
+    def dump(self, path):
+        """
+        Menyimpan isi ring buffer ke file JSON Chrome Trace Event.
+
+        Returns:
+            int: Jumlah event yang ditulis.
+        """
+        # Jumlah event diambil dari counter itu sendiri; slot yang terpakai ditandai agar dilewati
+        with self._lock:
+            total = next(self._counter)
+            self._phase[total % self.capacity] = PHASE_SKIP
+        count = min(total, self.capacity)
+        # Urutkan dari event tertua ke terbaru
+        order = (np.arange(count) + (total - count)) % self.capacity
+
+        # Metadata nama thread agar setiap jalur di trace viewer berlabel
+        events = [{"name": "thread_name", "ph": "M", "pid": 0, "tid": tid, "args": {"name": thread_name}}
+                  for tid, thread_name in self._thread_names.items()]
+
+        names = self._names
+        open_spans = {}  # (thread, nama) -> jumlah span yang sedang terbuka
+        written = 0
+        for name_id, phase, timestamp_ns, tid in zip(self._name_index[order].tolist(), self._phase[order].tolist(),
+                                                     self._timestamp_ns[order].tolist(), self._thread_id[order].tolist()):
+            if phase == PHASE_SKIP:
+                continue
+            key = (tid, name_id)
+            if phase == PHASE_END:
+                # Setelah ring buffer berputar, event B pasangannya bisa sudah tertimpa
+                if not open_spans.get(key):
+                    continue
+                open_spans[key] -= 1
+            else:
+                open_spans[key] = open_spans.get(key, 0) + 1
+            events.append({"name": names[name_id], "ph": _PHASE_CODES[phase], "ts": timestamp_ns / 1000.0,
+                           "pid": 0, "tid": tid})
+            written += 1
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Trace disimpan ke '{path}' ({written} event).")
+        return written
+
+
+# Tracer global yang dipakai oleh seluruh modul game
+tracer = Tracer()
+
+
+def traced(name):
+    """
+    Dekorator yang membungkus fungsi dalam span `name`. Saat tracing mati,
+    biayanya hanya satu pengecekan atribut.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
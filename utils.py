@@ -42,3 +42,14 @@ def is_visible(landmark_list):
         return (landmark_list[11].visibility > 0.7 and  # Bahu kiri terlihat jelas
                 landmark_list[12].visibility > 0.7)     # Bahu kanan terlihat jelas
     return False
+
+def calculate_speed_multiplier(volume, pitch, min_threshold, max_volume):
+    """
+    Menghitung tambahan kecepatan karakter dari volume dan pitch suara.
+    Volume dinormalisasi ke [0.0, 1.5] dan pitch 100-800 Hz dipetakan ke 0-5,
+    lalu keduanya dikalikan. Bernilai 0 jika volume tidak melewati ambang batas.
+    Bekerja untuk skalar maupun array NumPy (dipakai juga oleh simulator balancing).
+    """
+    normalized_volume = np.minimum(1.5, (volume - min_threshold) / (max_volume - min_threshold))
+    pitch_multiplier = np.clip((pitch - 100) / 140, 0.0, 5.0)
+    return np.where(volume > min_threshold, normalized_volume * pitch_multiplier, 0.0)
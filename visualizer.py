@@ -3,20 +3,22 @@ import cv2
 import numpy as np
 import os
 
+from tracing import traced
+
 class Button:
     """
     Kelas untuk merepresentasikan tombol interaktif dalam tampilan Pygame.
     Digunakan untuk tombol seperti Start, Restart, Exit, dll.
     """
-    def __init__(self, text, x, y, width, height, color=(200, 200, 200), text_color=(0, 0, 0)):
+    def __init__(self, text, x, y, width, height, color=(200, 200, 200), text_color=(0, 0, 0), font_size=36):
         """
-        Inisialisasi tombol dengan teks, posisi, ukuran, dan warna.
+        Inisialisasi tombol dengan teks, posisi, ukuran, warna, dan ukuran font.
         """
         self.text = text
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
         self.text_color = text_color
-        self.font = pygame.font.Font(None, 36)  # Gunakan font default
+        self.font = pygame.font.Font(None, font_size)  # Gunakan font default
 
     def draw(self, surface):
         """
@@ -33,14 +35,90 @@ class Button:
         """
         return self.rect.collidepoint(pos)
 
+def build_colormap_lut(size=256):
+    """
+    Membuat tabel warna (LUT) berukuran (size, 3) uint8 dari hitam -> ungu -> merah -> kuning -> putih.
+    Dihitung sekali agar pewarnaan spectrogram cukup berupa pengindeksan array.
+    """
+    anchors = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+    colors = np.array([(0, 0, 0), (80, 0, 120), (200, 30, 40), (250, 200, 0), (255, 255, 255)], dtype=np.float32)
+    positions = np.linspace(0.0, 1.0, size)
+    lut = np.stack([np.interp(positions, anchors, colors[:, c]) for c in range(3)], axis=1)
+    return lut.astype(np.uint8)
+
+
+class SpectrogramStrip:
+    """
+    Strip spectrogram bergulir dengan penanda pitch. Setiap blok audio baru hanya
+    menggeser isi surface satu kolom ke kiri dan mewarnai satu kolom baru di kanan,
+    sehingga strip tidak pernah digambar ulang seluruhnya.
+    """
+    def __init__(self, width, height, max_freq=2000.0, min_db=-80.0, max_db=0.0):
+        """
+        Parameters:
+            width (int): Lebar strip dalam piksel (jumlah blok audio yang terlihat).
+            height (int): Tinggi strip dalam piksel.
+            max_freq (float): Frekuensi tertinggi yang ditampilkan (Hz).
+            min_db (float): Level (dB relatif skala penuh) yang dipetakan ke warna terbawah.
+            max_db (float): Level (dB relatif skala penuh) yang dipetakan ke warna teratas.
+        """
+        self.width = width
+        self.height = height
+        self.max_freq = max_freq
+        self.min_db = min_db
+        self.max_db = max_db
+
+        self.surface = pygame.Surface((width, height))
+        self.surface.fill((0, 0, 0))
+        self._column = pygame.Surface((1, height))  # Kolom baru yang akan ditempel di kanan
+        self._column_pixels = np.zeros((1, height, 3), dtype=np.uint8)
+        self.lut = build_colormap_lut()
+
+        # Pemetaan baris piksel -> indeks bin FFT, dihitung ulang hanya jika ukuran spektrum berubah
+        self._row_bins = None
+        self._spectrum_key = None
+        self._row_freqs = np.linspace(max_freq, 0.0, height)  # Baris atas = frekuensi tertinggi
+
+        self.pitch = 0.0
+
+    def push(self, freqs, magnitudes, pitch=None):
+        """
+        Menambahkan satu kolom spektrum baru di sisi kanan strip.
+        """
+        key = (len(freqs), float(freqs[-1]))
+        if key != self._spectrum_key:
+            self._row_bins = np.clip(np.searchsorted(freqs, self._row_freqs), 0, len(freqs) - 1)
+            # Magnitudo sinus skala penuh setelah jendela Hamming ~ N * 0.54 / 2
+            self._reference = (2 * (len(freqs) - 1)) * 0.27
+            self._spectrum_key = key
+
+        levels = 20.0 * np.log10(magnitudes[self._row_bins] / self._reference + 1e-12)
+        indices = ((levels - self.min_db) * (255.0 / (self.max_db - self.min_db))).clip(0, 255).astype(np.uint8)
+        self._column_pixels[0] = self.lut[indices]
+
+        # Penanda pitch berupa piksel putih pada baris frekuensi pitch
+        if pitch:
+            self.pitch = pitch
+            if pitch <= self.max_freq:
+                row = int(round((1.0 - pitch / self.max_freq) * (self.height - 1)))
+                self._column_pixels[0, max(0, row - 1):row + 2] = (255, 255, 255)
+
+        self.surface.scroll(-1, 0)
+        pygame.surfarray.blit_array(self._column, self._column_pixels)
+        self.surface.blit(self._column, (self.width - 1, 0))
+
+
 class Visualizer:
     """
     Kelas untuk menangani semua tampilan visual permainan.
     Menggabungkan tampilan dari webcam (OpenCV) dan elemen permainan (Pygame).
     """
-    def __init__(self, im1_path=None, im2_path=None):
+    def __init__(self, im1_path=None, im2_path=None, render_scale=1.0):
         """
         Inisialisasi tampilan game, memuat gambar latar, dan mengatur area webcam serta permainan.
+        Jika render_scale < 1.0, permainan dirender pada resolusi internal yang lebih kecil
+        dan diperbesar ke ukuran jendela oleh pygame.SCALED. Semua ukuran dalam piksel
+        (font, offset, tombol) ikut diskalakan lewat scaled() agar tata letak tetap sama.
         """
         pygame.init()  # Wajib sebelum menggunakan fitur tampilan Pygame
 
@@ -52,13 +130,27 @@ class Visualizer:
         self.window_width = max(int(screen_width * 0.8), 800)
         self.window_height = max(int(screen_height * 0.9), 600)
 
-        self.screen = pygame.display.set_mode((self.window_width, self.window_height))
+        # Resolusi render internal (logis); semua tata letak memakai ukuran ini
+        self.render_scale = render_scale
+        flags = 0
+        if render_scale < 1.0:
+            self.window_width = int(self.window_width * render_scale)
+            self.window_height = int(self.window_height * render_scale)
+            flags = pygame.SCALED
+
+        self.screen = pygame.display.set_mode((self.window_width, self.window_height), flags)
         pygame.display.set_caption("Suara Menentukan Nasib")
 
         # Area tampilan webcam dan permainan
         self.webcam_area_height = int(self.window_height * 0.5)
         self.game_area_height = self.window_height - self.webcam_area_height
 
+        # Skala ukuran tampilan webcam di dalam area webcam (diatur oleh QualityController)
+        self.webcam_scale = 1.0
+
+        # Pasangan indeks landmark yang dihubungkan garis (diisi dari InputHandler.pose_connections)
+        self.pose_connections = None
+
         # Gambar latar default jika tidak disediakan
         default_im1 = 'im1.png'
         default_im2 = 'im2.png'
@@ -76,9 +168,20 @@ class Visualizer:
             self.background_red_img.fill((255, 0, 0))
 
         # Font untuk berbagai elemen UI
-        self.font_large = pygame.font.Font(None, 60)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 28)
+        self.font_large = pygame.font.Font(None, self.scaled(60))
+        self.font_medium = pygame.font.Font(None, self.scaled(36))
+        self.font_small = pygame.font.Font(None, self.scaled(28))
+
+        # Buffer instant replay (opsional) yang merekam setiap layar yang selesai digambar
+        self.replay = None
+
+        # Strip spectrogram dan label pitch di bagian bawah area webcam
+        self.spectrogram = SpectrogramStrip(self.window_width, max(self.scaled(40), self.webcam_area_height // 6))
+        self.pitch_label = None
+
+    def scaled(self, value):
+        # Mengubah ukuran dalam piksel resolusi penuh menjadi piksel resolusi render internal
+        return max(1, int(round(value * self.render_scale)))
 
     def _convert_opencv_frame_to_pygame(self, cv_frame):
         """
@@ -86,13 +189,43 @@ class Visualizer:
         """
         cv_frame = cv2.flip(cv_frame, 1)  # Kamera depan (mirror view)
         cv_frame = cv2.cvtColor(cv_frame, cv2.COLOR_BGR2RGB)
-        cv_frame = cv2.resize(cv_frame, (self.window_width, self.webcam_area_height))
+        size = (int(self.window_width * self.webcam_scale), int(self.webcam_area_height * self.webcam_scale))
+        cv_frame = cv2.resize(cv_frame, size)
         return pygame.surfarray.make_surface(cv_frame.swapaxes(0, 1))
 
-    def draw(self, cv_frame, player, environment, notification="", buttons=None, game_started=False):
+    def update_spectrogram(self, freqs, magnitudes, pitch):
+        """
+        Menambahkan spektrum blok audio terbaru ke strip spectrogram dan memperbarui label pitch.
+        """
+        self.spectrogram.push(freqs, magnitudes, pitch)
+        self.pitch_label = self.font_small.render(f"Pitch: {pitch:.0f} Hz", True, (255, 255, 255))
+
+    def _draw_landmark_overlay(self, landmarks, rect, min_visibility=0.5):
+        """
+        Menggambar landmark pose langsung di atas permukaan webcam yang sudah diskalakan.
+        Semua koordinat dihitung sekaligus dengan NumPy (termasuk efek cermin),
+        sehingga frame kamera tidak perlu disalin dan digambari di resolusi penuh.
+        """
+        points = np.empty((len(landmarks), 2), dtype=np.float32)
+        points[:, 0] = rect.x + (1.0 - landmarks[:, 0]) * rect.width   # Mirror seperti tampilan webcam
+        points[:, 1] = rect.y + landmarks[:, 1] * rect.height
+        points = points.astype(np.int32)
+        visible = landmarks[:, 2] >= min_visibility
+
+        if self.pose_connections is not None and len(self.pose_connections):
+            connections = self.pose_connections[self.pose_connections.max(axis=1) < len(points)]
+            connections = connections[visible[connections[:, 0]] & visible[connections[:, 1]]]
+            for start, end in points[connections].tolist():
+                pygame.draw.line(self.screen, (255, 255, 255), start, end, self.scaled(2))
+
+        for point in points[visible].tolist():
+            pygame.draw.circle(self.screen, (255, 0, 0), point, self.scaled(4))
+
+    @traced("Visualizer.draw")
+    def draw(self, cv_frame, player, environment, notification="", buttons=None, game_started=False, landmarks=None):
         """
         Menangani semua tampilan yang muncul di layar:
-        - Webcam (atas)
+        - Webcam (atas) beserta overlay landmark pose (jika diberikan)
         - Notifikasi permainan
         - Area permainan dan karakter (bawah)
         """
@@ -100,22 +233,32 @@ class Visualizer:
 
         # --- TAMPILAN WEBCAM ---
         webcam_surface = self._convert_opencv_frame_to_pygame(cv_frame)
-        self.screen.blit(webcam_surface, (0, 0))
+        webcam_rect = webcam_surface.get_rect(center=(self.window_width // 2, self.webcam_area_height // 2))
+        self.screen.blit(webcam_surface, webcam_rect)
+        if landmarks is not None:
+            self._draw_landmark_overlay(landmarks, webcam_rect)
+
+        # Tampilkan spectrogram suara di bagian bawah area webcam (hanya saat permainan berjalan)
+        if game_started:
+            strip_y = self.webcam_area_height - self.spectrogram.height
+            self.screen.blit(self.spectrogram.surface, (0, strip_y))
+            if self.pitch_label:
+                self.screen.blit(self.pitch_label, (self.scaled(10), strip_y + self.scaled(5)))
 
         # Tampilkan sisa waktu
         remaining_time_text = f"Waktu Tersisa: {int(environment.get_remaining_game_time())} detik"
         time_surface = self.font_medium.render(remaining_time_text, True, (255, 255, 255))
-        self.screen.blit(time_surface, (20, 20))
+        self.screen.blit(time_surface, (self.scaled(20), self.scaled(20)))
 
         # Tampilkan notifikasi permainan (centered)
         if notification:
             lines = notification.split("\n")
-            y = self.webcam_area_height // 2 + 30
+            y = self.webcam_area_height // 2 + self.scaled(30)
             for line in lines:
                 text_surface = self.font_large.render(line, True, (255, 255, 255))
                 text_rect = text_surface.get_rect(center=(self.window_width // 2, y))
                 self.screen.blit(text_surface, text_rect)
-                y += 50
+                y += self.scaled(50)
 
         # Tampilkan tombol (jika ada)
         if buttons:
@@ -128,10 +271,11 @@ class Visualizer:
             self.screen.blit(game_background, (0, self.webcam_area_height))
 
             # Tampilkan karakter pemain (Mario)
-            player_frame_rgba = player.get_current_frame()
-            if player_frame_rgba is not None:
-                player_surface = pygame.image.frombuffer(player_frame_rgba.tobytes(), player_frame_rgba.shape[1::-1], "RGBA")
-                self.screen.blit(player_surface, (int(player.x - 50), int(self.webcam_area_height + (player.y - 75))))
+            player_sprite = player.get_current_sprite()
+            if player_sprite is not None:
+                atlas_surface, frame_rect = player_sprite
+                position = (int(player.x - self.scaled(50)), int(self.webcam_area_height + (player.y - self.scaled(75))))
+                self.screen.blit(atlas_surface, position, frame_rect)
 
             # Tampilkan status lampu (merah/hijau)
             if environment.is_red_light():
@@ -150,8 +294,19 @@ class Visualizer:
             black_bg.fill((0, 0, 0))
             self.screen.blit(black_bg, (0, self.webcam_area_height))
 
+            # Pratinjau skin karakter yang sedang dipilih di tengah area permainan
+            player_sprite = player.get_current_sprite()
+            if player_sprite is not None:
+                atlas_surface, frame_rect = player_sprite
+                preview_rect = frame_rect.copy()
+                preview_rect.center = (self.window_width // 2, self.webcam_area_height + self.game_area_height // 2)
+                self.screen.blit(atlas_surface, preview_rect, frame_rect)
+
         pygame.display.flip()  # Perbarui seluruh tampilan
 
+        if self.replay is not None:
+            self.replay.capture(self.screen)
+
     def display_final_message(self, result_text, save_button=None, restart_button=None, exit_button=None):
         """
         Menampilkan pesan akhir setelah permainan selesai.
@@ -163,29 +318,44 @@ class Visualizer:
         message_surface.fill((255, 255, 255))  # Background putih
 
         # Tampilkan teks hasil
-        font_title = pygame.font.Font(None, 50)
-        font_result = pygame.font.Font(None, 40)
+        font_title = pygame.font.Font(None, self.scaled(50))
+        font_result = pygame.font.Font(None, self.scaled(40))
 
         title_text = font_title.render("--- Hasil Permainan ---", True, (0, 0, 0))
         result_line = font_result.render(result_text, True, (0, 0, 255))
 
-        message_surface.blit(title_text, title_text.get_rect(center=(message_surface.get_width() // 2, 50)))
-        message_surface.blit(result_line, result_line.get_rect(center=(message_surface.get_width() // 2, 120)))
+        message_surface.blit(title_text, title_text.get_rect(center=(message_surface.get_width() // 2, self.scaled(50))))
+        message_surface.blit(result_line, result_line.get_rect(center=(message_surface.get_width() // 2, self.scaled(120))))
 
         # Tampilkan pesan di tengah layar
         self.screen.fill((0, 0, 0))
-        self.screen.blit(message_surface, message_surface.get_rect(center=(self.window_width // 2, self.window_height // 2 - 50)))
+        self.screen.blit(message_surface, message_surface.get_rect(center=(self.window_width // 2, self.window_height // 2 - self.scaled(50))))
 
         # Atur dan gambar tombol
-        button_y_pos = self.window_height // 2 + 100
+        button_y_pos = self.window_height // 2 + self.scaled(100)
         if save_button:
-            save_button.rect.center = (self.window_width // 2 - 180, button_y_pos)
+            save_button.rect.center = (self.window_width // 2 - self.scaled(180), button_y_pos)
             save_button.draw(self.screen)
         if restart_button:
-            restart_button.rect.center = (self.window_width // 2 - 100, button_y_pos)
+            restart_button.rect.center = (self.window_width // 2 - self.scaled(100), button_y_pos)
             restart_button.draw(self.screen)
         if exit_button:
-            exit_button.rect.center = (self.window_width // 2 + 100, button_y_pos)
+            exit_button.rect.center = (self.window_width // 2 + self.scaled(100), button_y_pos)
             exit_button.draw(self.screen)
 
         pygame.display.flip()  # Perbarui tampilan
+
+    def draw_replay_frame(self, frame_surface):
+        """
+        Menampilkan satu frame instant replay di bagian atas layar hasil,
+        di atas kotak pesan yang digambar oleh display_final_message.
+        """
+        area_height = int(self.window_height * 0.3) - self.scaled(60)
+        if area_height <= 0:
+            return
+        scale = min(area_height / frame_surface.get_height(), (self.window_width * 0.9) / frame_surface.get_width())
+        size = (int(frame_surface.get_width() * scale), int(frame_surface.get_height() * scale))
+        rect = pygame.Rect(0, 0, *size)
+        rect.center = (self.window_width // 2, self.scaled(10) + area_height // 2)
+        self.screen.blit(pygame.transform.scale(frame_surface, size), rect)
+        pygame.display.update(rect)